@@ -0,0 +1,203 @@
+# Stress-scenario benchmark: runs the game with no window and reports
+# per-phase frame timings as JSON.
+#
+#   python benchmark.py                       # every scenario
+#   python benchmark.py boss-red-phase --frames 1200 --output bench.json
+import argparse
+import json
+import platform
+import subprocess
+import sys
+
+import numpy as np
+
+import main
+
+DEFAULT_FRAMES = 600
+DEFAULT_SEED = 1234
+PHASES = ('update', 'collision', 'draw', 'flip')
+
+def skip_warp(game):
+    # Finish the warp-in on the next update so the player acts immediately
+    game.player.warp_start_time = -game.player.warp_duration
+
+def make_invulnerable(game):
+    # Collision checks still run against the player, but it never dies
+    player = game.player
+    player.lives = 10**6
+    player.invulnerable = True
+    player.invulnerability_duration = 10**9
+
+def stop_natural_spawns(game):
+    # The scenario decides what spawns and when
+    game.scripted = True
+
+def spawn_asteroids(game, count, area=None):
+    # Top up the asteroid count, placing new asteroids inside area
+    area = area or main.pygame.Rect(0, 0, main.WINDOW_WIDTH, main.WINDOW_HEIGHT // 2)
+    while len(game.enemies) < count:
+        level = main.rng.spawn.choice([1, 2, 3, 4])
+        enemy = main.Enemy(level)
+        enemy.rect.center = (main.rng.spawn.randrange(area.left, area.right),
+                             main.rng.spawn.randrange(area.top, area.bottom))
+        enemy.add(game.all_sprites, game.enemies)
+
+def sweep(frame, period=60):
+    return 'left' if (frame // period) % 2 else 'right'
+
+def asteroid_field(game):
+    # 200 asteroids with continuous triple-shot
+    skip_warp(game)
+    make_invulnerable(game)
+    stop_natural_spawns(game)
+    game.player.power_up('triple_shot')
+    game.player.power_up_time = 10**9
+
+    def frame(i):
+        spawn_asteroids(game, 200)
+        return {'shoot', sweep(i)}
+    return frame
+
+def boss_red_phase(game):
+    # Boss in its fastest phase, firing as often as possible
+    skip_warp(game)
+    make_invulnerable(game)
+    stop_natural_spawns(game)
+    for enemy in game.enemies:
+        enemy.kill()
+    game.boss_spawned = True
+    game.boss = main.AlienBoss(game, main.WINDOW_WIDTH * main.BOSS_SIZE_FRACTION)
+    game.boss.rect.centery = game.boss.target_y
+    game.boss.has_reached_position = True
+    game.boss.base_shoot_delay = 100
+    game.all_sprites.add(game.boss)
+
+    def frame(i):
+        # Keep the boss in the red phase without dropping power-ups
+        game.boss.health = game.boss.max_health * 0.25
+        game.boss.last_powerup_drop = game.boss.health
+        return {sweep(i, 90)}
+    return frame
+
+def asteroid_explosions(game):
+    # 20 simultaneous level-4 asteroid explosions, repeated every second
+    skip_warp(game)
+    make_invulnerable(game)
+    stop_natural_spawns(game)
+    size = main.ASTEROID_LEVELS[4][0]
+
+    def frame(i):
+        if i % main.FPS == 0:
+            for _ in range(20):
+                x = main.rng.spawn.randrange(main.WINDOW_WIDTH)
+                y = main.rng.spawn.randrange(main.WINDOW_HEIGHT)
+                game.all_sprites.add(main.AsteroidExplosion(x, y, size, 4))
+        return set()
+    return frame
+
+def shield_dense_field(game):
+    # Shield active while flying through a dense asteroid field
+    skip_warp(game)
+    make_invulnerable(game)
+    stop_natural_spawns(game)
+    game.player.power_up('shield')
+    game.player.shield_time = 10**9
+
+    def frame(i):
+        area = game.player.rect.inflate(600, 400)
+        spawn_asteroids(game, 150, area.clip(main.pygame.Rect(0, 0, main.WINDOW_WIDTH, main.WINDOW_HEIGHT)))
+        return {sweep(i)}
+    return frame
+
+SCENARIOS = {
+    'asteroid-field': asteroid_field,
+    'boss-red-phase': boss_red_phase,
+    'asteroid-explosions': asteroid_explosions,
+    'shield-dense-field': shield_dense_field,
+}
+
+def summarize(samples):
+    samples = np.asarray(samples) * 1000  # Milliseconds
+    return {
+        'mean_ms': round(float(samples.mean()), 4),
+        'p95_ms': round(float(np.percentile(samples, 95)), 4),
+        'p99_ms': round(float(np.percentile(samples, 99)), 4),
+        'max_ms': round(float(samples.max()), 4),
+    }
+
+def run_scenario(name, frames, seed, rocket_type='default', dirty_rects=False):
+    for pool in main.sprite_pools.values():
+        pool.reset_stats()
+    game = main.Game(rocket_type, headless=True, seed=seed, dirty_rects=dirty_rects)
+    next_inputs = SCENARIOS[name](game)
+    samples = {phase: [] for phase in PHASES}
+    totals = []
+    for i in range(frames):
+        game.step(next_inputs(i))
+        game.draw(main.screen)
+        game.present()
+        for phase in PHASES:
+            samples[phase].append(game.timings[phase])
+        totals.append(sum(game.timings[phase] for phase in PHASES))
+    game.close()
+    result = {phase: summarize(samples[phase]) for phase in PHASES}
+    result['frame'] = summarize(totals)
+    # Pool sizes and high-water marks, for sizing pools for bullet-heavy phases
+    result['pools'] = {name: pool.stats() for name, pool in main.sprite_pools.items()}
+    return result
+
+def build_id():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def parse_size(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description='Run headless stress scenarios and report frame timings.')
+    parser.add_argument('scenarios', nargs='*', help='scenarios to run (default: all)')
+    parser.add_argument('--frames', type=int, default=DEFAULT_FRAMES)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--size', type=parse_size, default=main.HEADLESS_SIZE, help='window size, e.g. 1920x1080')
+    parser.add_argument('--dirty', action='store_true', help='use dirty-rectangle rendering')
+    parser.add_argument('--output', help='write JSON results to this file instead of stdout')
+    parser.add_argument('--list', action='store_true', help='list scenarios and exit')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print('\n'.join(SCENARIOS))
+        return 0
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f'unknown scenario(s): {", ".join(unknown)}')
+
+    main.init_pygame(headless=True, size=args.size)
+    results = {
+        'build': build_id(),
+        'machine': platform.platform(),
+        'python': platform.python_version(),
+        'pygame': main.pygame.version.ver,
+        'window': list(args.size),
+        'frames': args.frames,
+        'seed': args.seed,
+        'dirty_rects': args.dirty,
+        'scenarios': {},
+    }
+    for name in args.scenarios or SCENARIOS:
+        results['scenarios'][name] = run_scenario(name, args.frames, args.seed, dirty_rects=args.dirty)
+        print(f"{name}: {results['scenarios'][name]['frame']['mean_ms']:.2f} ms/frame", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
@@ -1,22 +1,25 @@
+import time
+startup_time = time.perf_counter()  # For reporting time to first frame
+
 import pygame
 import sys
 import random
 import math
 import os
 import json
+import hashlib
+import weakref
+from collections import OrderedDict, deque
 import numpy as np
-import scipy.io.wavfile as wavfile
-from PIL import Image, ImageDraw
-
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
+# scipy and PIL are slow to import and only needed to generate missing
+# assets, so the generators import them themselves
 
-# Get screen info for fullscreen
-screen_info = pygame.display.Info()
-WINDOW_WIDTH = screen_info.current_w
-WINDOW_HEIGHT = screen_info.current_h
+# Window size, display and sounds are set up by init_pygame()
+WINDOW_WIDTH = 1280
+WINDOW_HEIGHT = 720
+HEADLESS_SIZE = (1280, 720)  # Default window size when running without a display
 FPS = 60
+PAUSED_FPS = 5  # Event polling rate while the window is in the background
 
 # Colors
 WHITE = (255, 255, 255)
@@ -27,61 +30,302 @@ GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 GRAY = (100, 100, 100)
 
-# Set up the display - true fullscreen with hardware acceleration
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), 
-                               pygame.FULLSCREEN | pygame.HWSURFACE | pygame.DOUBLEBUF | pygame.SCALED)
-pygame.display.set_caption("Rocket Game")
-clock = pygame.time.Clock()
-
-# Load sounds
-shoot_sound = pygame.mixer.Sound('assets/shoot.wav')
-explosion_sound = pygame.mixer.Sound('assets/explosion.wav')
-powerup_sound = pygame.mixer.Sound('assets/powerup.wav')
-laser_sound = pygame.mixer.Sound('assets/laser.wav')
-
-# Set sound effect volumes (0.0 to 1.0)
-shoot_sound.set_volume(0.2)  # 20% volume
-explosion_sound.set_volume(0.3)  # 30% volume
-powerup_sound.set_volume(0.3)  # 30% volume
-laser_sound.set_volume(0.2)  # 20% volume
-
-# Load images
-def load_image(name, scale=1):
-    try:
-        image = pygame.image.load(os.path.join('assets', name))
-        if scale != 1:
-            new_size = (int(image.get_width() * scale), int(image.get_height() * scale))
-            image = pygame.transform.scale(image, new_size)
-        return image
-    except:
-        # Fallback to colored rectangle if image not found
-        surf = pygame.Surface((30, 50))
-        surf.fill(WHITE)
-        return surf
-
-def create_asteroid(size, level):
+ASTEROID_TEMPLATE_SEED = 1  # Asteroid shapes are the same every run, so masks are too
+BACKGROUND_SEED = 1  # Star and nebula layout, fixed so the baked background can be reused
+
+# Generated images are baked to disk and reused on later starts.
+# Bump a generator's version whenever its output changes.
+ASSET_CACHE_DIR = '.asset_cache'
+ASSET_VERSIONS = {
+    'create_space_background': 1,
+    'create_rocket_image': 1,
+    'create_asteroid_template': 1,
+    'create_powerup': 1,
+    'create_boss': 1,
+}
+WINDOW_SIZED_ASSETS = {'create_space_background'}  # Builders whose output depends on the window size
+
+# Rocket stats, shown on the selection screen
+ROCKET_TYPES = {
+    'default': {'speed': 5, 'shoot_delay': 250, 'description': 'Balanced: Good speed and fire rate'},
+    'speed': {'speed': 7, 'shoot_delay': 300, 'description': 'Speed: Faster movement but slower fire rate'},
+    'heavy': {'speed': 3, 'shoot_delay': 200, 'description': 'Heavy: Slower but faster fire rate'},
+}
+
+screen = None
+clock = None
+space_background = None
+fade_surface = None
+shoot_sound = None
+explosion_sound = None
+powerup_sound = None
+laser_sound = None
+
+class SimClock:
+    # Game time in milliseconds, advanced once per simulation step. With a
+    # fixed step, time only moves when the game steps, so a slow frame can't
+    # change the outcome; otherwise it follows the wall clock.
+    def __init__(self):
+        self.fixed_step = None
+        self.ticks = 0
+        self.start = 0
+        self.paused_at = None
+
+    def reset(self, fixed_step=None):
+        self.fixed_step = fixed_step
+        self.ticks = 0
+        self.start = pygame.time.get_ticks()
+        self.paused_at = None
+
+    def pause(self):
+        if self.paused_at is None:
+            self.paused_at = pygame.time.get_ticks()
+
+    def resume(self):
+        # Wall-clock time spent paused doesn't count as game time
+        if self.paused_at is not None:
+            self.start += pygame.time.get_ticks() - self.paused_at
+            self.paused_at = None
+
+    def advance(self):
+        if self.fixed_step:
+            self.ticks += self.fixed_step
+        else:
+            self.ticks = pygame.time.get_ticks() - self.start
+
+    def get_ticks(self):
+        return int(self.ticks)
+
+sim_clock = SimClock()
+
+class RandomStreams:
+    # One seeded stream per subsystem, so e.g. extra visual effects never
+    # shift where asteroids spawn. No seed means a fresh random game.
+    def __init__(self, seed=None):
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        self.base_seed = seed
+        self.spawn = self.stream(seed, 'spawn')  # Enemies and power-ups
+        self.visual = self.stream(seed, 'visual')  # Effects with no gameplay impact
+        self.boss = self.stream(seed, 'boss')  # Boss attack patterns
+        # Explosion particles
+        self.particles = np.random.default_rng(None if seed is None else [seed, 1])
+
+    def stream(self, seed, name):
+        if seed is None:
+            return random.Random()
+        return random.Random(f'{seed}:{name}')
+
+rng = RandomStreams()
+
+class SurfaceCounter:
+    # Counts surfaces created during the current frame, for the performance overlay
+    def __init__(self):
+        self.count = 0
+
+    def add(self, count=1):
+        self.count += count
+
+    def start_frame(self):
+        self.count = 0
+
+surface_counter = SurfaceCounter()
+
+def count_surfaces(value):
+    # Surfaces in a builder's result, which may be nested tuples of surfaces and rects
+    if isinstance(value, pygame.Surface):
+        return 1
+    if isinstance(value, (tuple, list)):
+        return sum(count_surfaces(item) for item in value)
+    return 0
+
+class AssetCache:
+    # PNGs of generated images, keyed by generator, its version, parameters
+    # and, for WINDOW_SIZED_ASSETS, the window size
+    def __init__(self, directory=ASSET_CACHE_DIR):
+        self.directory = directory
+
+    def path(self, builder, args):
+        name = builder.__name__
+        key = [name, ASSET_VERSIONS[name], args]
+        if name in WINDOW_SIZED_ASSETS:
+            key.append([WINDOW_WIDTH, WINDOW_HEIGHT])
+        key = json.dumps(key)
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f'{name}-{digest}.png')
+
+    def get(self, builder, *args):
+        path = self.path(builder, args)
+        try:
+            return self.prepare(pygame.image.load(path))
+        except (pygame.error, OSError):
+            pass
+        surface = builder(*args)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename, so a crash never leaves a truncated PNG behind
+            temp_path = path[:-len('.png')] + '.tmp.png'
+            pygame.image.save(surface, temp_path)
+            os.replace(temp_path, path)
+        except (pygame.error, OSError):
+            pass  # Caching is best effort
+        return surface
+
+    def prepare(self, surface):
+        # Match the pixel format of the display for fast blits, once there is one
+        if pygame.display.get_surface() is None:
+            return surface
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+asset_cache = AssetCache()
+
+class SurfaceRegistry:
+    # Builds each distinct image once, keyed by its builder and parameters,
+    # and hands out shared references
+    def __init__(self):
+        self.surfaces = {}
+
+    def get(self, builder, *args):
+        key = (builder, args)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            if builder.__name__ in ASSET_VERSIONS:
+                surface = asset_cache.get(builder, *args)
+            else:
+                surface = builder(*args)
+            # Builders such as create_shield_frames return whole sets of frames
+            surface_counter.add(count_surfaces(surface))
+            self.surfaces[key] = surface
+        return surface
+
+surface_registry = SurfaceRegistry()
+
+TEXT_CACHE_SIZE = 256  # Rendered strings kept around
+
+class TextCache:
+    # One Font per size, and rendered text keyed by (size, text, color) so a
+    # string is only rasterized again once it changes. Least recently used go first.
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+    def render(self, text, size, color):
+        # Shared surface: callers that change its alpha must set it before every blit
+        key = (size, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = self.font(size).render(text, True, color)
+        surface_counter.add()
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+text_cache = TextCache()
+
+class MaskCache:
+    # One collision mask per distinct image, built on first use and dropped with the image
+    def __init__(self):
+        self.masks = weakref.WeakKeyDictionary()
+
+    def get(self, surface):
+        mask = self.masks.get(surface)
+        if mask is None:
+            mask = pygame.mask.from_surface(surface)
+            self.masks[surface] = mask
+        return mask
+
+mask_cache = MaskCache()
+
+class MaskedSprite(pygame.sprite.Sprite):
+    # pygame.sprite.collide_mask uses sprite.mask when present, so sprites that
+    # draw from cached images get their cached masks instead of a rebuild per call
+    @property
+    def mask(self):
+        return mask_cache.get(self.image)
+
+def create_blank_surface(size):
+    return pygame.Surface(size, pygame.SRCALPHA)
+
+def radial_gradient(surface, center, radii, color, alphas):
+    # Same pixels as pygame.draw.circle(surface, (*color, alphas[i]), center, radii[i])
+    # for each radius in turn, largest first, but written in one pass.
+    # radii must be evenly spaced. Circles overwrite rather than blend, so
+    # each pixel ends up with the color of the smallest radius covering it.
+    if len(radii) == 0:
+        return
+    outer, inner = int(radii[0]), int(radii[-1])
+    if not surface.get_flags() & pygame.SRCALPHA:
+        # Without per-pixel alpha every circle is the same solid color
+        pygame.draw.circle(surface, color, center, outer)
+        return
+    # Every listed circle lies inside the outer one, so it sets the color; only alpha varies
+    pygame.draw.circle(surface, color, center, outer)
+
+    # Alpha by pixel offset from the center, counting from 1. The disc is
+    # symmetric, so one quadrant is computed and mirrored.
+    offsets = np.arange(1, outer + 1, dtype=np.int32)
+    j = offsets[:, None]
+    k = offsets[None, :]
+    # pygame's midpoint circle of radius r covers the pixel once 4r^2 reaches
+    # this, except radius 1, which is a 2x2 block
+    reach = np.minimum(4 * k * k + (2 * j - 1) ** 2, 4 * j * j + (2 * k - 1) ** 2)
+    reach[0, 0] = 4
+    smallest = np.ceil(np.sqrt(reach) / 2).astype(np.int32)
+    # Alpha of the smallest listed radius of at least r, or -1 past the outer circle
+    step = (outer - inner) // (len(radii) - 1) if len(radii) > 1 else 1
+    by_radius = np.full(outer + 2, -1, dtype=np.int16)
+    by_radius[:outer + 1] = np.asarray(alphas)[np.minimum((outer - np.arange(outer + 1)) // step, len(radii) - 1)]
+    quadrant = by_radius[np.minimum(smallest, outer + 1)]
+    disc = np.block([[quadrant[::-1, ::-1], quadrant[::-1, :]],
+                     [quadrant[:, ::-1], quadrant]])  # Indexed [x, y] like surfarray
+
+    cx, cy = center
+    width, height = surface.get_size()
+    left, right = max(cx - outer, 0), min(cx + outer, width)
+    top, bottom = max(cy - outer, 0), min(cy + outer, height)
+    if left >= right or top >= bottom:
+        return
+    disc = disc[left - (cx - outer):right - (cx - outer), top - (cy - outer):bottom - (cy - outer)]
+    alpha = pygame.surfarray.pixels_alpha(surface)[left:right, top:bottom]
+    np.copyto(alpha, disc, casting='unsafe', where=disc >= 0)
+    del alpha
+
+def create_asteroid(size, level, rand=random):
     surface = pygame.Surface((size, size), pygame.SRCALPHA)
     points = []
     for i in range(12):  # More points for smoother shape
         angle = i * (360 / 12)
-        radius = size/2 * (0.8 + random.random() * 0.4)
+        radius = size/2 * (0.8 + rand.random() * 0.4)
         x = size/2 + radius * math.cos(math.radians(angle))
         y = size/2 + radius * math.sin(math.radians(angle))
         points.append((x, y))
     
     # Create gradient effect
-    for r in range(size//2, 0, -1):
-        alpha = int(255 * (r / (size/2)))
-        # Color based on level
-        if level == 4:
-            color = (200, 0, 0, alpha)  # Red for level 4
-        elif level == 3:
-            color = (180, 0, 0, alpha)  # Dark red for level 3
-        elif level == 2:
-            color = (200, 200, 0, alpha)  # Yellow for level 2
-        else:
-            color = (150, 150, 150, alpha)  # Gray for level 1
-        pygame.draw.circle(surface, color, (size//2, size//2), r)
+    # Color based on level
+    if level == 4:
+        color = (200, 0, 0)  # Red for level 4
+    elif level == 3:
+        color = (180, 0, 0)  # Dark red for level 3
+    elif level == 2:
+        color = (200, 200, 0)  # Yellow for level 2
+    else:
+        color = (150, 150, 150)  # Gray for level 1
+    radii = np.arange(size//2, 0, -1)
+    radial_gradient(surface, (size//2, size//2), radii, color, (255 * (radii / (size/2))).astype(int))
     
     # Draw main shape
     if level == 4:
@@ -107,48 +351,123 @@ def create_asteroid(size, level):
     
     # Add craters
     for _ in range(3):
-        x = random.randint(size//4, 3*size//4)
-        y = random.randint(size//4, 3*size//4)
-        r = random.randint(2, size//8)
+        x = rand.randint(size//4, 3*size//4)
+        y = rand.randint(size//4, 3*size//4)
+        r = rand.randint(2, size//8)
         pygame.draw.circle(surface, (80, 80, 80), (x, y), r)
     
     return surface
 
-def create_space_background():
+# Asteroid rotation cache settings
+ROTATION_STEP = 3  # Degrees between cached rotation frames
+ROTATION_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Memory cap for cached frames
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+class RotationCache:
+    def __init__(self, step=ROTATION_STEP, max_bytes=ROTATION_CACHE_MAX_BYTES):
+        self.step = step
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.frames = OrderedDict()  # (template, angle) -> (image, rect)
+
+    def snap(self, angle):
+        return int(round(angle / self.step) * self.step) % 360
+
+    def get(self, template, angle):
+        key = (template, self.snap(angle))
+        frame = self.frames.get(key)
+        if frame is not None:
+            self.frames.move_to_end(key)
+            return frame
+
+        image = pygame.transform.rotate(template, key[1])
+        surface_counter.add()
+        frame = (image, image.get_rect())
+        self.frames[key] = frame
+        self.bytes_used += surface_bytes(image)
+
+        # Evict least recently used frames once over the memory cap
+        while self.bytes_used > self.max_bytes and len(self.frames) > 1:
+            _, (old_image, _) = self.frames.popitem(last=False)
+            self.bytes_used -= surface_bytes(old_image)
+        return frame
+
+    def clear(self):
+        self.frames.clear()
+        self.bytes_used = 0
+
+rotation_cache = RotationCache()
+
+# Asteroid stats per level: (size, health, points)
+ASTEROID_LEVELS = {
+    1: (25, 1, 10),
+    2: (35, 3, 20),
+    3: (45, 5, 30),
+    4: (60, 10, 50),
+}
+ASTEROID_VARIANTS = 6  # Prebuilt shape variants per level (memory vs variety)
+
+def create_asteroid_template(seed, level, variant):
+    # Each variant has its own random stream, so any one can be rebuilt alone
+    size = ASTEROID_LEVELS[level][0]
+    return create_asteroid(size, level, random.Random(f'{seed}:{level}:{variant}'))
+
+class AsteroidTemplatePool:
+    def __init__(self, variants=ASTEROID_VARIANTS, seed=ASTEROID_TEMPLATE_SEED):
+        self.variants = variants
+        self.seed = seed
+        self.templates = {}  # level -> list of asteroid surfaces
+
+    def build_level(self, level):
+        self.templates[level] = [asset_cache.get(create_asteroid_template, self.seed, level, variant)
+                                 for variant in range(self.variants)]
+
+    def build(self):
+        for level in ASTEROID_LEVELS:
+            self.build_level(level)
+
+    def get(self, level):
+        if level not in self.templates:
+            self.build_level(level)
+        return rng.spawn.choice(self.templates[level])
+
+asteroid_templates = AsteroidTemplatePool()
+
+def create_space_background(seed=BACKGROUND_SEED):
     # Create a surface for the background
     background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
     background.fill(BLACK)
+    rand = random.Random(seed)
     
     # Add stars
     for _ in range(200):
-        x = random.randint(0, WINDOW_WIDTH)
-        y = random.randint(0, WINDOW_HEIGHT)
-        size = random.randint(1, 3)
-        brightness = random.randint(100, 255)
+        x = rand.randint(0, WINDOW_WIDTH)
+        y = rand.randint(0, WINDOW_HEIGHT)
+        size = rand.randint(1, 3)
+        brightness = rand.randint(100, 255)
         color = (brightness, brightness, brightness)
         pygame.draw.circle(background, color, (x, y), size)
     
     # Add nebula effect
     for _ in range(5):
-        x = random.randint(0, WINDOW_WIDTH)
-        y = random.randint(0, WINDOW_HEIGHT)
-        size = random.randint(100, 300)
+        x = rand.randint(0, WINDOW_WIDTH)
+        y = rand.randint(0, WINDOW_HEIGHT)
+        size = rand.randint(100, 300)
         color = (
-            random.randint(50, 100),  # R
-            random.randint(50, 100),  # G
-            random.randint(100, 150),  # B
+            rand.randint(50, 100),  # R
+            rand.randint(50, 100),  # G
+            rand.randint(100, 150),  # B
             30  # Alpha
         )
-        for r in range(size, 0, -1):
-            alpha = int(30 * (r / size))
-            pygame.draw.circle(background, (*color[:3], alpha), (x, y), r)
+        radii = np.arange(size, 0, -1)
+        radial_gradient(background, (x, y), radii, color[:3], (30 * (radii / size)).astype(int))
     
     return background
 
-# Create space background
-space_background = create_space_background()
-
 def create_sound_effects():
+    import scipy.io.wavfile as wavfile
     sample_rate = 44100
     
     # Shoot sound
@@ -180,6 +499,7 @@ def create_sound_effects():
     wavfile.write('assets/laser.wav', sample_rate, laser)
 
 def create_background_music():
+    import scipy.io.wavfile as wavfile
     sample_rate = 44100
     duration = 5.0  # 5 seconds loop
     t = np.linspace(0, duration, int(sample_rate * duration))
@@ -252,25 +572,22 @@ def show_game_over_screen(score, high_score, transition_state, fade_alpha, trans
         
         # Draw game over screen
         screen.fill(BLACK)
-        font = pygame.font.Font(None, 74)
-        text = font.render('GAME OVER', True, WHITE)
+        text = text_cache.render('GAME OVER', 74, WHITE)
         text_rect = text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/4))
         screen.blit(text, text_rect)
         
-        font = pygame.font.Font(None, 36)
-        score_text = font.render(f'Score: {score}', True, WHITE)
+        score_text = text_cache.render(f'Score: {score}', 36, WHITE)
         score_rect = score_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/3))
         screen.blit(score_text, score_rect)
         
-        high_score_text = font.render(f'High Score: {high_score}', True, WHITE)
+        high_score_text = text_cache.render(f'High Score: {high_score}', 36, WHITE)
         high_score_rect = high_score_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/3 + 50))
         screen.blit(high_score_text, high_score_rect)
         
         # Draw menu options
-        menu_font = pygame.font.Font(None, 48)
-        retry_text = menu_font.render('Press R to Retry', True, WHITE)
-        menu_text = menu_font.render('Press M for Main Menu', True, WHITE)
-        quit_text = menu_font.render('Press ESC to Quit', True, GRAY)
+        retry_text = text_cache.render('Press R to Retry', 48, WHITE)
+        menu_text = text_cache.render('Press M for Main Menu', 48, WHITE)
+        quit_text = text_cache.render('Press ESC to Quit', 48, GRAY)
         
         retry_rect = retry_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
         menu_rect = menu_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 60))
@@ -301,12 +618,8 @@ def show_game_over_screen(score, high_score, transition_state, fade_alpha, trans
     pygame.display.flip()
     return True, transition_state, fade_alpha, transition_start_time  # Keep showing game over screen
 
-def create_rocket_variations():
-    rockets = {}
-    
+def draw_default_rocket(draw):
     # Default Rocket (Balanced)
-    img = Image.new('RGBA', (60, 100), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
     # Create gradient for rocket body
     for y in range(100):
         alpha = int(255 * (1 - y/100))
@@ -323,12 +636,9 @@ def create_rocket_variations():
     # Windows
     draw.ellipse([(25, 30), (35, 40)], fill=(0, 191, 255))
     draw.ellipse([(25, 45), (35, 55)], fill=(0, 191, 255))
-    img.save('assets/rocket_default.png')
-    rockets['default'] = {'speed': 5, 'shoot_delay': 250, 'description': 'Balanced: Good speed and fire rate'}
 
+def draw_speed_rocket(draw):
     # Speed Rocket (Fast but slower fire rate)
-    img = Image.new('RGBA', (60, 100), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
     # Sleeker design
     draw.polygon([(30, 0), (15, 60), (45, 60)], fill=(150, 200, 255))
     # Add metallic shine
@@ -338,12 +648,9 @@ def create_rocket_variations():
     draw.polygon([(45, 60), (40, 60), (50, 80)], fill=(100, 150, 200))
     # Single window
     draw.ellipse([(25, 30), (35, 40)], fill=(0, 191, 255))
-    img.save('assets/rocket_speed.png')
-    rockets['speed'] = {'speed': 7, 'shoot_delay': 300, 'description': 'Speed: Faster movement but slower fire rate'}
 
+def draw_heavy_rocket(draw):
     # Heavy Rocket (Slower but faster fire rate)
-    img = Image.new('RGBA', (60, 100), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
     # Wider design
     draw.polygon([(30, 0), (5, 80), (55, 80)], fill=(255, 150, 150))
     # Add metallic shine
@@ -355,128 +662,191 @@ def create_rocket_variations():
     draw.ellipse([(20, 30), (30, 40)], fill=(0, 191, 255))
     draw.ellipse([(30, 30), (40, 40)], fill=(0, 191, 255))
     draw.ellipse([(25, 45), (35, 55)], fill=(0, 191, 255))
-    img.save('assets/rocket_heavy.png')
-    rockets['heavy'] = {'speed': 3, 'shoot_delay': 200, 'description': 'Heavy: Slower but faster fire rate'}
-
-    return rockets
-
-# Create rocket variations
-ROCKET_TYPES = create_rocket_variations()
 
-def show_start_screen():
+def create_rocket_image(rocket_type):
+    from PIL import Image, ImageDraw
+    img = Image.new('RGBA', (60, 100), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    if rocket_type == 'speed':
+        draw_speed_rocket(draw)
+    elif rocket_type == 'heavy':
+        draw_heavy_rocket(draw)
+    else:
+        draw_default_rocket(draw)
+    return pygame.image.frombytes(img.tobytes(), img.size, 'RGBA')
+
+def load_rocket_image(rocket_type, scale=1):
+    image = surface_registry.get(create_rocket_image, rocket_type)
+    if scale != 1:
+        new_size = (int(image.get_width() * scale), int(image.get_height() * scale))
+        image = pygame.transform.scale(image, new_size)
+    return image
+
+# Warp-in: the rocket shrinks from WARP_START_SCALE to full size in WARP_SCALE_STEPS steps
+WARP_START_SCALE = 2.5
+WARP_SCALE_STEPS = 30
+
+def create_warp_ladder(rocket_type, scale):
+    # (image, rect) for each warp step, largest first; the last step is the rocket itself
+    image = load_rocket_image(rocket_type, scale)
+    width, height = image.get_size()
+    ladder = []
+    for step in range(WARP_SCALE_STEPS):
+        step_scale = WARP_START_SCALE - (WARP_START_SCALE - 1) * step / WARP_SCALE_STEPS
+        frame = pygame.transform.scale(image, (int(width * step_scale), int(height * step_scale)))
+        ladder.append((frame, frame.get_rect()))
+    ladder.append((image, image.get_rect()))
+    return tuple(ladder)
+
+def wait_for_event(warm_up=None):
+    # Like pygame.event.wait, but runs warm_up in between until it is done
+    while warm_up is not None and warm_up.pending():
+        event = pygame.event.poll()
+        if event.type != pygame.NOEVENT:
+            return event
+        warm_up.run()
+        draw_warm_up_progress(warm_up)
+    return pygame.event.wait()
+
+def draw_warm_up_progress(warm_up):
+    # Label and bar in the bottom-left corner of the menu; cleared when done
+    area = pygame.Rect(0, WINDOW_HEIGHT - 30, 240, 30)
+    screen.fill(BLACK, area)
+    if warm_up.pending():
+        label = text_cache.render(f'Loading {warm_up.label}', 24, GRAY)
+        screen.blit(label, (10, area.top))
+        pygame.draw.rect(screen, GRAY, (10, WINDOW_HEIGHT - 10, 200, 4), 1)
+        pygame.draw.rect(screen, WHITE, (10, WINDOW_HEIGHT - 10, int(200 * warm_up.progress()), 4))
+    pygame.display.update(area)
+
+def show_start_screen(while_waiting=None, warm_up=None):
+    # while_waiting runs once the title is on screen; warm_up runs while
+    # waiting for a key
     screen.fill(BLACK)
     
     # Draw title
-    title_font = pygame.font.Font(None, 100)
-    title_text = title_font.render('SPACE FRONTIERS', True, WHITE)
+    title_text = text_cache.render('SPACE FRONTIERS', 100, WHITE)
     title_rect = title_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//4))
     screen.blit(title_text, title_rect)
     
     # Draw "Press any key" text with flashing effect
     flash_alpha = int(255 * (0.5 + 0.5 * math.sin(pygame.time.get_ticks() / 200)))
-    start_font = pygame.font.Font(None, 50)
-    start_text = start_font.render('Press any button to start', True, WHITE)
+    start_text = text_cache.render('Press any button to start', 50, WHITE)
     start_text.set_alpha(flash_alpha)
     start_rect = start_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
     screen.blit(start_text, start_rect)
     
     pygame.display.flip()
+    if while_waiting:
+        while_waiting()
     
+    # Nothing on the title screen moves, so sleep until there is input
     waiting = True
     while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYUP:
-                waiting = False
-
-def show_rocket_selection(rockets):
+        event = wait_for_event(warm_up)
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+        if event.type == pygame.KEYUP:
+            waiting = False
+        elif event.type == pygame.WINDOWEXPOSED:
+            pygame.display.flip()
+
+def show_rocket_selection(rockets, warm_up=None):
     selected_rocket = 'default'
     selection_active = True
+    redraw = True
     
     while selection_active:
-        screen.fill(BLACK)
+        # Redraw only when the selection changes, and sleep until there is input
+        if redraw:
+            draw_rocket_selection(rockets, selected_rocket)
+            if warm_up is not None:
+                draw_warm_up_progress(warm_up)
+            redraw = False
         
-        # Draw title
-        title_font = pygame.font.Font(None, 80)
-        title_text = title_font.render('Select Your Rocket', True, WHITE)
-        title_rect = title_text.get_rect(center=(WINDOW_WIDTH//2, 50))
-        screen.blit(title_text, title_rect)
+        event = wait_for_event(warm_up)
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
+        if event.type == pygame.WINDOWEXPOSED:
+            redraw = True
+        if event.type == pygame.KEYUP:
+            previous = selected_rocket
+            if event.key == pygame.K_UP:
+                if selected_rocket == 'speed':
+                    selected_rocket = 'default'
+                elif selected_rocket == 'heavy':
+                    selected_rocket = 'speed'
+            elif event.key == pygame.K_DOWN:
+                if selected_rocket == 'default':
+                    selected_rocket = 'speed'
+                elif selected_rocket == 'speed':
+                    selected_rocket = 'heavy'
+            elif event.key == pygame.K_RETURN:
+                selection_active = False
+            redraw = selected_rocket != previous
+    
+    return selected_rocket
+
+def draw_rocket_selection(rockets, selected_rocket):
+    screen.fill(BLACK)
+    
+    # Draw title
+    title_text = text_cache.render('Select Your Rocket', 80, WHITE)
+    title_rect = title_text.get_rect(center=(WINDOW_WIDTH//2, 50))
+    screen.blit(title_text, title_rect)
+    
+    # Draw rocket options
+    y_pos = 150
+    for rocket_type, data in rockets.items():
+        # Draw rocket image
+        rocket_img = load_rocket_image(rocket_type, 0.5)
+        img_rect = rocket_img.get_rect(center=(WINDOW_WIDTH//2, y_pos))
+        screen.blit(rocket_img, img_rect)
         
-        # Draw rocket options
-        y_pos = 150
-        for rocket_type, data in rockets.items():
-            # Draw rocket image
-            rocket_img = load_image(f'rocket_{rocket_type}.png', 0.5)
-            img_rect = rocket_img.get_rect(center=(WINDOW_WIDTH//2, y_pos))
-            screen.blit(rocket_img, img_rect)
-            
-            # Draw rocket name and description
-            font = pygame.font.Font(None, 36)
-            name_text = font.render(rocket_type.capitalize(), True, WHITE)
-            desc_text = font.render(data['description'], True, GRAY)
-            
-            name_rect = name_text.get_rect(center=(WINDOW_WIDTH//2, y_pos + 60))
-            desc_rect = desc_text.get_rect(center=(WINDOW_WIDTH//2, y_pos + 90))
-            
-            screen.blit(name_text, name_rect)
-            screen.blit(desc_text, desc_rect)
-            
-            # Draw selection indicator
-            if rocket_type == selected_rocket:
-                pygame.draw.rect(screen, GREEN, (img_rect.left - 10, img_rect.top - 10, 
-                                               img_rect.width + 20, img_rect.height + 20), 2)
-            
-            y_pos += 200
+        # Draw rocket name and description
+        name_text = text_cache.render(rocket_type.capitalize(), 36, WHITE)
+        desc_text = text_cache.render(data['description'], 36, GRAY)
         
-        # Draw selection instructions
-        font = pygame.font.Font(None, 36)
-        instructions = font.render('Use UP/DOWN to select, ENTER to confirm', True, WHITE)
-        screen.blit(instructions, (WINDOW_WIDTH//2 - 200, WINDOW_HEIGHT - 50))
+        name_rect = name_text.get_rect(center=(WINDOW_WIDTH//2, y_pos + 60))
+        desc_rect = desc_text.get_rect(center=(WINDOW_WIDTH//2, y_pos + 90))
         
-        pygame.display.flip()
+        screen.blit(name_text, name_rect)
+        screen.blit(desc_text, desc_rect)
         
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYUP:
-                if event.key == pygame.K_UP:
-                    if selected_rocket == 'speed':
-                        selected_rocket = 'default'
-                    elif selected_rocket == 'heavy':
-                        selected_rocket = 'speed'
-                elif event.key == pygame.K_DOWN:
-                    if selected_rocket == 'default':
-                        selected_rocket = 'speed'
-                    elif selected_rocket == 'speed':
-                        selected_rocket = 'heavy'
-                elif event.key == pygame.K_RETURN:
-                    selection_active = False
+        # Draw selection indicator
+        if rocket_type == selected_rocket:
+            pygame.draw.rect(screen, GREEN, (img_rect.left - 10, img_rect.top - 10, 
+                                           img_rect.width + 20, img_rect.height + 20), 2)
+        
+        y_pos += 200
     
-    return selected_rocket
+    # Draw selection instructions
+    instructions = text_cache.render('Use UP/DOWN to select, ENTER to confirm', 36, WHITE)
+    screen.blit(instructions, (WINDOW_WIDTH//2 - 200, WINDOW_HEIGHT - 50))
+    
+    pygame.display.flip()
 
 def create_powerup(type):
     size = 40  # Increased from 30 to 40
     surface = pygame.Surface((size, size), pygame.SRCALPHA)
     
     # Create glossy background with brighter colors
-    for r in range(size//2, 0, -1):
-        alpha = int(255 * (r / (size/2)))
-        if type == 'shield':
-            color = (0, 255, 0, alpha)  # Bright green
-        elif type == 'laser':
-            color = (0, 191, 255, alpha)  # Bright blue
-        else:  # triple_shot
-            color = (255, 255, 0, alpha)  # Bright yellow
-        pygame.draw.circle(surface, color, (size//2, size//2), r)
+    if type == 'shield':
+        color = (0, 255, 0)  # Bright green
+    elif type == 'laser':
+        color = (0, 191, 255)  # Bright blue
+    else:  # triple_shot
+        color = (255, 255, 0)  # Bright yellow
+    radii = np.arange(size//2, 0, -1)
+    radial_gradient(surface, (size//2, size//2), radii, color, (255 * (radii / (size/2))).astype(int))
     
     # Add bright highlight
     pygame.draw.ellipse(surface, (255, 255, 255, 150), (2, 2, size//3, size//3))
     
     # Add letter based on power-up type
-    font = pygame.font.Font(None, 36)  # Larger font
+    font = text_cache.font(36)  # Larger font
     if type == 'shield':
         letter = 'S'
         color = (0, 255, 0)  # Green
@@ -500,54 +870,47 @@ def create_powerup(type):
     
     return surface
 
-class Enemy(pygame.sprite.Sprite):
+class Enemy(MaskedSprite):
     def __init__(self, level=1):
         super().__init__()
         self.level = level
-        if level == 1:
-            size = 25
-            self.health = 1
-            self.points = 10
-        elif level == 2:
-            size = 35
-            self.health = 3
-            self.points = 20
-        elif level == 3:
-            size = 45
-            self.health = 5
-            self.points = 30
-        else:  # level 4
-            size = 60
-            self.health = 10
-            self.points = 50
+        if level not in ASTEROID_LEVELS:
+            level = 4
+        _, self.health, self.points = ASTEROID_LEVELS[level]
         
-        self.original_image = create_asteroid(size, level)
+        self.original_image = asteroid_templates.get(level)
         self.image = self.original_image
         self.rect = self.image.get_rect()
-        self.rect.x = random.randrange(WINDOW_WIDTH - self.rect.width)
-        self.rect.y = random.randrange(-100, -40)
-        self.speedy = random.randrange(1, 4)
-        self.speedx = random.randrange(-2, 2)
+        self.rect.x = rng.spawn.randrange(WINDOW_WIDTH - self.rect.width)
+        self.rect.y = rng.spawn.randrange(-100, -40)
+        self.speedy = rng.spawn.randrange(1, 4)
+        self.speedx = rng.spawn.randrange(-2, 2)
         self.rotation = 0
-        self.rotation_speed = random.randrange(-3, 4)
+        self.rotation_speed = rng.spawn.randrange(-3, 4)
 
     def update(self):
         self.rect.y += self.speedy
         self.rect.x += self.speedx
         self.rotation = (self.rotation + self.rotation_speed) % 360
-        self.image = pygame.transform.rotate(self.original_image, self.rotation)
-        self.rect = self.image.get_rect(center=self.rect.center)
+        # Look up the pre-rotated frame instead of rotating every frame
+        center = self.rect.center
+        self.image, rect = rotation_cache.get(self.original_image, self.rotation)
+        self.rect = rect.copy()
+        self.rect.center = center
         
         if self.rect.top > WINDOW_HEIGHT or self.rect.left < -25 or self.rect.right > WINDOW_WIDTH + 25:
-            self.rect.x = random.randrange(WINDOW_WIDTH - self.rect.width)
-            self.rect.y = random.randrange(-100, -40)
-            self.speedy = random.randrange(1, 4)
+            self.rect.x = rng.spawn.randrange(WINDOW_WIDTH - self.rect.width)
+            self.rect.y = rng.spawn.randrange(-100, -40)
+            self.speedy = rng.spawn.randrange(1, 4)
 
-class Player(pygame.sprite.Sprite):
-    def __init__(self, rocket_type='default'):
+class Player(MaskedSprite):
+    def __init__(self, game, rocket_type='default'):
         super().__init__()
+        self.game = game
         self.rocket_type = rocket_type
-        self.original_image = load_image(f'rocket_{rocket_type}.png', 0.6)
+        # Scaled frames for the warp-in, shared by every Player of this rocket type
+        self.warp_ladder = surface_registry.get(create_warp_ladder, rocket_type, 0.6)
+        self.original_image = self.warp_ladder[-1][0]
         self.image = self.original_image
         self.rect = self.image.get_rect()
         # Start from off-screen right
@@ -556,6 +919,7 @@ class Player(pygame.sprite.Sprite):
         
         # Create smaller hitbox
         self.hitbox_scale = 0.98  # 98% of original size
+        self.hitbox_rect = pygame.Rect(0, 0, 0, 0)
         self.update_hitbox()
         
         # Get rocket stats
@@ -563,7 +927,7 @@ class Player(pygame.sprite.Sprite):
         self.speed = rocket_data['speed']
         self.shoot_delay = rocket_data['shoot_delay']
         
-        self.last_shot = pygame.time.get_ticks()
+        self.last_shot = sim_clock.get_ticks()
         self.lives = 3
         self.shield = False
         self.shield_time = 0
@@ -574,7 +938,7 @@ class Player(pygame.sprite.Sprite):
         self.original_speed = self.speed
         self.shoot_sound = pygame.mixer.Sound('assets/shoot.wav')
         self.shoot_sound.set_volume(0.2)
-        self.shield_surface = pygame.Surface((self.rect.width + 20, self.rect.height + 20), pygame.SRCALPHA)
+        self.shield_frames = surface_registry.get(create_shield_frames, self.rect.size)
         self.shield_alpha = 0
         self.shield_alpha_change = 5
         self.active_laser = None
@@ -591,32 +955,27 @@ class Player(pygame.sprite.Sprite):
         self.invulnerability_duration = 2000  # 2 seconds of invulnerability (increased from 1 second)
         
         # Warp-in animation properties
-        self.warp_start_time = pygame.time.get_ticks()
+        self.warp_start_time = sim_clock.get_ticks()
         self.warp_duration = 1500  # 1.5 seconds for smoother animation
         self.is_warping = True
         self.warp_particles = []
         self.original_y = WINDOW_HEIGHT - 10  # Target position
-        self.original_size = self.original_image.get_size()
-        self.current_scale = 2.5  # Start at 2.5x size
+        self.warp_step = None
         self.start_x = self.rect.centerx
         self.target_x = WINDOW_WIDTH // 2  # Center of screen
 
     def update_hitbox(self):
-        # Create a smaller surface for the hitbox
-        hitbox_size = (int(self.rect.width * self.hitbox_scale), 
-                      int(self.rect.height * self.hitbox_scale))
-        self.hitbox = pygame.Surface(hitbox_size, pygame.SRCALPHA)
-        self.hitbox.fill((0, 0, 0, 0))  # Transparent
-        # Draw a simple shape for collision detection
-        pygame.draw.rect(self.hitbox, (255, 255, 255), self.hitbox.get_rect())
-        self.hitbox_rect = self.hitbox.get_rect(center=self.rect.center)
+        # Shrink the hitbox around the rocket in place; pixel-accurate checks use self.mask
+        self.hitbox_rect.size = (int(self.rect.width * self.hitbox_scale),
+                                 int(self.rect.height * self.hitbox_scale))
+        self.hitbox_rect.center = self.rect.center
 
     def update(self):
         # If game over, don't update anything
-        if game_over:
+        if self.game.game_over:
             return
 
-        current_time = pygame.time.get_ticks()
+        current_time = sim_clock.get_ticks()
         
         # Handle warp-in animation
         if self.is_warping:
@@ -643,20 +1002,22 @@ class Player(pygame.sprite.Sprite):
                 self.rect.centerx = current_x
                 self.rect.bottom = current_y
                 
-                # Calculate scale (from 2.5 to 1.0) with easing
-                self.current_scale = 2.5 - (1.5 * warp_progress)
-                new_size = (int(self.original_size[0] * self.current_scale), 
-                          int(self.original_size[1] * self.current_scale))
-                self.image = pygame.transform.scale(self.original_image, new_size)
-                self.rect = self.image.get_rect(center=self.rect.center)
+                # Shrink from WARP_START_SCALE to full size along the pre-scaled ladder
+                step = int(round(warp_progress * WARP_SCALE_STEPS))
+                if step != self.warp_step:
+                    self.warp_step = step
+                    center = self.rect.center
+                    self.image, rect = self.warp_ladder[step]
+                    self.rect = rect.copy()
+                    self.rect.center = center
                 self.update_hitbox()  # Update hitbox during warp
                 
                 # Add warp particles
-                if random.random() < 0.3:  # 30% chance each frame
+                if rng.visual.random() < 0.3:  # 30% chance each frame
                     particle = {
-                        'x': self.rect.centerx + random.randint(-20, 20),
-                        'y': self.rect.centery + random.randint(-10, 10),
-                        'size': random.randint(2, 5),
+                        'x': self.rect.centerx + rng.visual.randint(-20, 20),
+                        'y': self.rect.centery + rng.visual.randint(-10, 10),
+                        'size': rng.visual.randint(2, 5),
                         'alpha': 255,
                         'color': (0, 191, 255)  # Cyan color
                     }
@@ -708,18 +1069,18 @@ class Player(pygame.sprite.Sprite):
                 self.power_up_time = 0
 
             # Handle movement
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT]:
+            inputs = self.game.inputs
+            if 'left' in inputs:
                 self.rect.x -= self.speed
-            if keys[pygame.K_RIGHT]:
+            if 'right' in inputs:
                 self.rect.x += self.speed
-            if keys[pygame.K_UP]:
+            if 'up' in inputs:
                 self.rect.y -= self.speed
-            if keys[pygame.K_DOWN]:
+            if 'down' in inputs:
                 self.rect.y += self.speed
 
             # Keep player on screen
-            self.rect.clamp_ip(screen.get_rect())
+            self.rect.clamp_ip(pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT))
             # Add top border at 10% of screen height
             top_border = int(WINDOW_HEIGHT * 0.1)
             if self.rect.top < top_border:
@@ -727,13 +1088,13 @@ class Player(pygame.sprite.Sprite):
             self.update_hitbox()  # Update hitbox after movement
 
             # Handle shooting
-            if keys[pygame.K_SPACE]:
+            if 'shoot' in inputs:
                 if current_time - self.last_shot > self.shoot_delay:
                     self.shoot()
                     self.last_shot = current_time
                 if self.laser_active and not self.active_laser:
-                    self.active_laser = Laser(self.rect.centerx, self.rect.top)
-                    all_sprites.add(self.active_laser)
+                    self.active_laser = Laser(self)
+                    self.game.all_sprites.add(self.active_laser)
             else:
                 if self.active_laser:
                     self.active_laser.kill()
@@ -743,79 +1104,63 @@ class Player(pygame.sprite.Sprite):
             if self.laser_active and self.active_laser:
                 self.active_laser.update()
 
-            # Handle shield damage to enemies
-            if self.shield:
-                # Check for enemy collisions with shield
-                shield_hits = pygame.sprite.spritecollide(self, enemies, False, pygame.sprite.collide_mask)
-                for enemy in shield_hits:
-                    if not isinstance(enemy, AlienBoss):  # Don't damage bosses
-                        enemy.health -= 1
-                        if enemy.health <= 0:
-                            self.score += enemy.points  # Use self.score instead of score
-                            explosion_sound.play()
-                            explosion = AsteroidExplosion(enemy.rect.centerx, enemy.rect.centery, enemy.rect.width, enemy.level)
-                            all_sprites.add(explosion)
-                            enemy.kill()
-                
-                # Check for enemy bullet collisions with shield
-                bullet_hits = pygame.sprite.spritecollide(self, enemy_bullets, True)
-                for bullet in bullet_hits:
-                    explosion_sound.play()
+    def update_shield(self):
+        # Called from the collision phase, once the collision grids are rebuilt
+        if self.shield and not self.is_respawning and not self.is_warping:
+            # Check for enemy collisions with shield
+            shield_hits = self.game.enemy_grid.collide(self, False, pygame.sprite.collide_mask)
+            for enemy in shield_hits:
+                if not isinstance(enemy, AlienBoss):  # Don't damage bosses
+                    enemy.health -= 1
+                    if enemy.health <= 0:
+                        self.score += enemy.points  # Use self.score instead of score
+                        explosion_sound.play()
+                        explosion = AsteroidExplosion(enemy.rect.centerx, enemy.rect.centery, enemy.rect.width, enemy.level)
+                        self.game.all_sprites.add(explosion)
+                        enemy.kill()
+            
+            # Check for enemy bullet collisions with shield
+            bullet_hits = self.game.enemy_bullet_grid.collide(self, True)
+            for bullet in bullet_hits:
+                explosion_sound.play()
 
     def draw(self, surface):
+        # Returns the screen rects drawn over
+        dirty = []
+
         # Draw warp particles
-        for particle in self.warp_particles:
-            particle_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            color = (*particle['color'], particle['alpha'])
-            pygame.draw.circle(particle_surface, color, (particle['size'], particle['size']), particle['size'])
-            surface.blit(particle_surface, (particle['x'] - particle['size'], particle['y'] - particle['size']))
+        if self.warp_particles:
+            rects = surface.blits([(stamp_atlas.glow(particle['size'], particle['color'], particle['alpha']),
+                                    (particle['x'] - particle['size'], particle['y'] - particle['size']))
+                                   for particle in self.warp_particles])
+            dirty.append(rects[0].unionall(rects[1:]))
         
         if self.visible:
             # Draw shield if active
             if self.shield:
-                self.shield_alpha = int(128 + 127 * math.sin(pygame.time.get_ticks() / 500))
-                shield_color = (0, 255, 0, self.shield_alpha)
-                self.shield_surface.fill((0, 0, 0, 0))
-                
-                pygame.draw.ellipse(self.shield_surface, shield_color, self.shield_surface.get_rect(), 4)
-                
-                inner_glow = pygame.Surface((self.rect.width + 10, self.rect.height + 10), pygame.SRCALPHA)
-                pygame.draw.ellipse(inner_glow, (0, 255, 0, 50), inner_glow.get_rect())
-                inner_glow_rect = inner_glow.get_rect(center=self.shield_surface.get_rect().center)
-                self.shield_surface.blit(inner_glow, inner_glow_rect)
-                
-                current_time = pygame.time.get_ticks()
-                for i in range(8):
-                    angle = (current_time / 500 + i * 45) % 360
-                    rad_angle = math.radians(angle)
-                    distance = self.rect.width * 0.6
-                    x = self.shield_surface.get_rect().centerx + math.cos(rad_angle) * distance
-                    y = self.shield_surface.get_rect().centery + math.sin(rad_angle) * distance
-                    
-                    sparkle_size = 3
-                    sparkle_color = (255, 255, 255, self.shield_alpha)
-                    pygame.draw.circle(self.shield_surface, sparkle_color, (int(x), int(y)), sparkle_size)
-                    glow_surface = pygame.Surface((sparkle_size * 4, sparkle_size * 4), pygame.SRCALPHA)
-                    pygame.draw.circle(glow_surface, (255, 255, 255, 50), (sparkle_size * 2, sparkle_size * 2), sparkle_size * 2)
-                    glow_rect = glow_surface.get_rect(center=(int(x), int(y)))
-                    self.shield_surface.blit(glow_surface, glow_rect)
-                
-                shield_rect = self.shield_surface.get_rect(center=self.rect.center)
-                surface.blit(self.shield_surface, shield_rect)
+                # Pick the pre-rendered frame for the current pulse and sparkle angle
+                current_time = sim_clock.get_ticks()
+                self.shield_alpha = int(128 + 127 * math.sin(current_time / 500))
+                level = int(round(self.shield_alpha / stamp_atlas.alpha_step))
+                step = int(current_time / 500 % (360 // SHIELD_SPARKLES) // SHIELD_SPARKLE_STEP)
+                shield_frame = self.shield_frames[level][step]
+                shield_rect = shield_frame.get_rect(center=self.rect.center)
+                dirty.append(surface.blit(shield_frame, shield_rect))
             
             # Draw player
-            surface.blit(self.image, self.rect)
+            dirty.append(surface.blit(self.image, self.rect))
             
             # Draw active laser if any
             if self.active_laser:
-                self.active_laser.draw(surface)
+                dirty.extend(self.active_laser.draw(surface))
+        return dirty
 
     def respawn(self):
         self.rect.centerx = WINDOW_WIDTH // 2
         self.rect.bottom = WINDOW_HEIGHT - 10
         self.visible = False  # Hide the ship during respawn delay
         self.is_respawning = True
-        self.respawn_time = pygame.time.get_ticks()
+        self.respawn_time = sim_clock.get_ticks()
         self.invulnerable = False  # Don't start invulnerability until after delay
         self.update_hitbox()  # Update hitbox after respawn
 
@@ -828,7 +1173,7 @@ class Player(pygame.sprite.Sprite):
     def power_up(self, type):
         if type == 'shield':
             self.shield = True
-            self.shield_time = pygame.time.get_ticks() + 15000  # 15 seconds
+            self.shield_time = sim_clock.get_ticks() + 15000  # 15 seconds
             powerup_sound.play()
             return  # Don't clear other power-ups for shield
         
@@ -842,7 +1187,7 @@ class Player(pygame.sprite.Sprite):
         self.speed = self.original_speed
         
         # Set new power-up
-        self.power_up_time = pygame.time.get_ticks() + 15000  # 15 seconds
+        self.power_up_time = sim_clock.get_ticks() + 15000  # 15 seconds
         if type == 'speed':
             self.speed_boost = True
             self.speed = self.original_speed * 1.5
@@ -852,8 +1197,8 @@ class Player(pygame.sprite.Sprite):
             powerup_sound.play()
         elif type == 'laser':
             self.laser_active = True
-            self.active_laser = Laser(self.rect.centerx, self.rect.top)
-            all_sprites.add(self.active_laser)
+            self.active_laser = Laser(self)
+            self.game.all_sprites.add(self.active_laser)
             laser_sound.play()  # Play laser sound when activating laser power-up
 
     def shoot(self):
@@ -864,27 +1209,81 @@ class Player(pygame.sprite.Sprite):
         if self.triple_shot:
             # Shoot three bullets in a spread pattern
             for angle in [-15, 0, 15]:
-                bullet = Bullet(self.rect.centerx, self.rect.top, angle)
-                all_sprites.add(bullet)
-                bullets.add(bullet)
+                bullet = bullet_pool.acquire(self.rect.centerx, self.rect.top, angle)
+                bullet.add(self.game.all_sprites, self.game.bullets)
         else:
             # Shoot single bullet
-            bullet = Bullet(self.rect.centerx, self.rect.top)
-            all_sprites.add(bullet)
-            bullets.add(bullet)
+            bullet = bullet_pool.acquire(self.rect.centerx, self.rect.top)
+            bullet.add(self.game.all_sprites, self.game.bullets)
+
+def create_bullet(angle):
+    surface = pygame.Surface((5, 10))
+    surface.fill(YELLOW)
+    if angle != 0:
+        surface = pygame.transform.rotate(surface, angle)
+    return surface
+
+class SpritePool:
+    # Recycles killed sprites of one class instead of allocating new ones
+    def __init__(self, sprite_class):
+        self.sprite_class = sprite_class
+        self.free = []
+        self.created = 0
+        self.in_use = 0
+        self.high_water = 0  # Most sprites in use at once
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args, **kwargs)
+        else:
+            sprite = self.sprite_class(*args, **kwargs)
+            sprite.pool = self
+            self.created += 1
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return sprite
+
+    def release(self, sprite):
+        self.in_use -= 1
+        self.free.append(sprite)
+
+    def reset_stats(self):
+        # Start a new high-water mark, e.g. for each benchmark scenario
+        self.high_water = self.in_use
+
+    def stats(self):
+        return {
+            'size': self.created,
+            'free': len(self.free),
+            'in_use': self.in_use,
+            'high_water': self.high_water,
+        }
+
+class PooledSprite(pygame.sprite.Sprite):
+    pool = None
 
-class Bullet(pygame.sprite.Sprite):
+    def kill(self):
+        # Go back to the pool only when actually leaving the game
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+class Bullet(PooledSprite):
     def __init__(self, x, y, angle=0):
         super().__init__()
-        self.image = pygame.Surface((5, 10))
-        self.image.fill(YELLOW)
+        self.reset(x, y, angle)
+
+    def reset(self, x, y, angle=0):
+        self.image = surface_registry.get(create_bullet, angle)
         self.rect = self.image.get_rect()
         self.rect.centerx = x
         self.rect.bottom = y
+        self.speedx = 0
         self.speedy = -10
         self.angle = angle
         if angle != 0:
-            self.image = pygame.transform.rotate(self.image, angle)
             # Adjust speed based on angle
             rad_angle = math.radians(angle)
             self.speedx = math.sin(rad_angle) * 10
@@ -899,29 +1298,33 @@ class Bullet(pygame.sprite.Sprite):
         if self.rect.bottom < 0:
             self.kill()
 
+bullet_pool = SpritePool(Bullet)
+
+def create_explosion_frames(size):
+    images = []
+    for i in range(8):
+        img = pygame.Surface((size, size), pygame.SRCALPHA)
+        color = (255, 100, 0, 255 - i * 30)  # Orange to transparent
+        pygame.draw.circle(img, color, (size//2, size//2), size//2 - i * 2)
+        images.append(img)
+    return tuple(images)
+
 class Explosion(pygame.sprite.Sprite):
     def __init__(self, x, y, size):
         super().__init__()
-        self.images = []
-        for i in range(8):
-            img = pygame.Surface((size, size), pygame.SRCALPHA)
-            color = (255, 100, 0, 255 - i * 30)  # Orange to transparent
-            pygame.draw.circle(img, color, (size//2, size//2), size//2 - i * 2)
-            self.images.append(img)
+        self.images = surface_registry.get(create_explosion_frames, size)
         self.index = 0
         self.image = self.images[self.index]
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = sim_clock.get_ticks()
         self.frame_rate = 50
         
-        # Create particles
-        self.particles = []
-        for _ in range(20):  # Number of particles
-            self.particles.append(Particle(x, y, size))
+        # Emit particles into the shared particle system
+        particle_system.emit(x, y, 20)
 
     def update(self):
-        now = pygame.time.get_ticks()
+        now = sim_clock.get_ticks()
         if now - self.last_update > self.frame_rate:
             self.last_update = now
             self.index += 1
@@ -929,102 +1332,252 @@ class Explosion(pygame.sprite.Sprite):
                 self.kill()
             else:
                 self.image = self.images[self.index]
-        
-        # Update particles
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.lifetime <= 0:
-                self.particles.remove(particle)
 
     def draw(self, surface):
-        # Draw particles
-        for particle in self.particles:
-            particle.draw(surface)
-        # Draw explosion
+        # Particles are drawn by particle_system
         surface.blit(self.image, self.rect)
 
-class Particle:
-    def __init__(self, x, y, size, color=None):
-        self.x = x
-        self.y = y
-        self.size = random.uniform(1, 3)  # Smaller particles
-        # More varied colors for particles
-        if color is None:
-            if random.random() < 0.3:  # 30% chance for white/yellow particles
-                self.color = (
-                    random.randint(200, 255),  # R
-                    random.randint(200, 255),  # G
-                    random.randint(100, 200),  # B
-                    255                        # A
-                )
-            else:  # 70% chance for orange/red particles
-                self.color = (
-                    random.randint(200, 255),  # R
-                    random.randint(50, 150),   # G
-                    random.randint(0, 50),     # B
-                    255                        # A
-                )
+# Stamp bucketing: color channels snap to STAMP_COLOR_STEP, alpha to STAMP_ALPHA_LEVELS
+STAMP_COLOR_STEP = 32
+STAMP_ALPHA_LEVELS = 16
+
+class StampAtlas:
+    # Pre-rendered discs shared by everything that draws small soft shapes
+    def __init__(self):
+        self.stamps = {}
+        self.color_levels = 256 // STAMP_COLOR_STEP
+        self.alpha_step = 255 / (STAMP_ALPHA_LEVELS - 1)
+
+    def disc(self, radius, color, alpha=255):
+        key = ('disc', radius, color, alpha)
+        stamp = self.stamps.get(key)
+        if stamp is None:
+            stamp = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            surface_counter.add()
+            pygame.draw.circle(stamp, (*color, alpha), (radius, radius), radius)
+            self.stamps[key] = stamp
+        return stamp
+
+    def ellipse(self, size, color, alpha=255):
+        key = ('ellipse', size, color, alpha)
+        stamp = self.stamps.get(key)
+        if stamp is None:
+            stamp = pygame.Surface(size, pygame.SRCALPHA)
+            surface_counter.add()
+            pygame.draw.ellipse(stamp, (*color, alpha), stamp.get_rect())
+            self.stamps[key] = stamp
+        return stamp
+
+    def glow(self, radius, color, alpha):
+        # Disc with alpha snapped to one of STAMP_ALPHA_LEVELS, so fading effects share stamps
+        return self.disc(radius, color, self.quantize_alpha(alpha))
+
+    def quantize_alpha(self, alpha):
+        return int(round(round(alpha / self.alpha_step) * self.alpha_step))
+
+    def particle_keys(self, radius, colors):
+        # Pack radius, color bucket and alpha level into one int per particle, -1 if invisible
+        levels = self.color_levels
+        rgb = colors[:, :3].astype(np.int64) // STAMP_COLOR_STEP
+        alpha = np.rint(colors[:, 3] / self.alpha_step).astype(np.int64)
+        keys = ((radius * levels + rgb[:, 0]) * levels + rgb[:, 1]) * levels + rgb[:, 2]
+        keys = keys * STAMP_ALPHA_LEVELS + alpha
+        keys[(radius <= 0) | (alpha <= 0)] = -1
+        return keys
+
+    def particle(self, key):
+        stamp = self.stamps.get(key)
+        if stamp is None:
+            levels = self.color_levels
+            rest, alpha = divmod(key, STAMP_ALPHA_LEVELS)
+            rest, b = divmod(rest, levels)
+            rest, g = divmod(rest, levels)
+            radius, r = divmod(rest, levels)
+            # Use the middle of each color bucket
+            color = tuple(c * STAMP_COLOR_STEP + STAMP_COLOR_STEP // 2 for c in (r, g, b))
+            stamp = self.disc(radius, color, int(round(alpha * self.alpha_step)))
+            self.stamps[key] = stamp
+        return stamp
+
+stamp_atlas = StampAtlas()
+
+# Shield animation: the pulse alpha is snapped to STAMP_ALPHA_LEVELS and the
+# sparkle ring, which repeats every 360 / SHIELD_SPARKLES degrees, to SHIELD_SPARKLE_STEP
+SHIELD_SPARKLES = 8
+SHIELD_SPARKLE_STEP = 5
+
+def create_shield_frames(size):
+    # frames[alpha_level][sparkle_step] for a rocket of the given size
+    width, height = size
+    inner_glow = stamp_atlas.ellipse((width + 10, height + 10), (0, 255, 0), 50)
+    sparkle_size = 3
+    sparkle_glow = stamp_atlas.disc(sparkle_size * 2, (255, 255, 255), 50)
+    distance = width * 0.6
+    period = 360 // SHIELD_SPARKLES
+    frames = []
+    for level in range(STAMP_ALPHA_LEVELS):
+        alpha = int(round(level * stamp_atlas.alpha_step))
+        row = []
+        for base_angle in range(0, period, SHIELD_SPARKLE_STEP):
+            frame = pygame.Surface((width + 20, height + 20), pygame.SRCALPHA)
+            frame_rect = frame.get_rect()
+            pygame.draw.ellipse(frame, (0, 255, 0, alpha), frame_rect, 4)
+            frame.blit(inner_glow, inner_glow.get_rect(center=frame_rect.center))
+            glows = []
+            for i in range(SHIELD_SPARKLES):
+                rad_angle = math.radians(base_angle + i * period)
+                x = int(frame_rect.centerx + math.cos(rad_angle) * distance)
+                y = int(frame_rect.centery + math.sin(rad_angle) * distance)
+                pygame.draw.circle(frame, (255, 255, 255, alpha), (x, y), sparkle_size)
+                glows.append((sparkle_glow, (x - sparkle_size * 2, y - sparkle_size * 2)))
+            frame.blits(glows, doreturn=False)
+            row.append(frame)
+        frames.append(tuple(row))
+    return tuple(frames)
+
+# Particle physics settings
+PARTICLE_GRAVITY = 0.15
+PARTICLE_JITTER_CHANCE = 0.1  # Chance per frame of a small random nudge
+PARTICLE_JITTER = 0.2
+
+class ParticleSystem:
+    # Every explosion particle lives in these parallel arrays, indices [0, count)
+    FIELDS = ('x', 'y', 'velocity_x', 'velocity_y', 'lifetime', 'original_lifetime',
+              'size', 'scale', 'scale_speed', 'rotation', 'rotation_speed')
+
+    def __init__(self, capacity=1024):
+        self.count = 0
+        self.capacity = 0
+        self.resize(capacity)
+
+    def resize(self, capacity):
+        for name in self.FIELDS:
+            array = np.zeros(capacity)
+            if self.capacity:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        colors = np.zeros((capacity, 4), dtype=np.uint8)
+        if self.capacity:
+            colors[:self.count] = self.colors[:self.count]
+        self.colors = colors
+        self.capacity = capacity
+
+    def clear(self):
+        self.count = 0
+
+    def default_colors(self, count):
+        generator = rng.particles
+        # 30% white/yellow particles, 70% orange/red particles
+        hot = generator.random(count) < 0.3
+        colors = np.empty((count, 3), dtype=np.int64)
+        colors[:, 0] = generator.integers(200, 256, count)
+        colors[:, 1] = np.where(hot, generator.integers(200, 256, count), generator.integers(50, 151, count))
+        colors[:, 2] = np.where(hot, generator.integers(100, 201, count), generator.integers(0, 51, count))
+        return colors
+
+    def themed_colors(self, palette, count):
+        # Pick a theme color per particle and add some variation to it
+        generator = rng.particles
+        palette = np.asarray(palette, dtype=np.int64)
+        colors = palette[generator.integers(0, len(palette), count)]
+        colors += generator.integers(-20, 21, (count, 3))
+        return np.clip(colors, 0, 255)
+
+    def emit(self, x, y, count, palette=None):
+        # Returns the number of frames until the last emitted particle dies
+        if count <= 0:
+            return 0
+        if self.count + count > self.capacity:
+            self.resize(max(self.capacity * 2, self.count + count))
+
+        generator = rng.particles
+        new = slice(self.count, self.count + count)
+        speed = generator.uniform(3, 8, count)
+        angle = np.radians(generator.uniform(0, 360, count))
+        lifetime = generator.integers(30, 61, count).astype(float)
+
+        self.x[new] = x
+        self.y[new] = y
+        self.velocity_x[new] = np.cos(angle) * speed
+        self.velocity_y[new] = np.sin(angle) * speed
+        self.lifetime[new] = lifetime
+        self.original_lifetime[new] = lifetime
+        self.size[new] = generator.uniform(1, 3, count)
+        self.scale[new] = 1.0
+        self.scale_speed[new] = generator.uniform(0.95, 0.98, count)  # Particles shrink over time
+        self.rotation[new] = generator.uniform(-5, 5, count)
+        self.rotation_speed[new] = generator.uniform(-2, 2, count)
+        if palette is None:
+            self.colors[new, :3] = self.default_colors(count)
         else:
-            self.color = color
-        self.speed = random.uniform(3, 8)  # Increased speed range
-        self.angle = random.uniform(0, 360)
-        self.lifetime = random.randint(30, 60)  # Longer lifetime
-        self.original_lifetime = self.lifetime
-        self.gravity = 0.15  # Increased gravity effect
-        self.velocity_x = math.cos(math.radians(self.angle)) * self.speed
-        self.velocity_y = math.sin(math.radians(self.angle)) * self.speed
-        self.rotation = random.uniform(-5, 5)  # Random rotation
-        self.rotation_speed = random.uniform(-2, 2)  # Random rotation speed
-        self.scale = 1.0
-        self.scale_speed = random.uniform(0.95, 0.98)  # Particles shrink over time
+            self.colors[new, :3] = self.themed_colors(palette, count)
+        self.colors[new, 3] = 255
+
+        self.count += count
+        return int(lifetime.max())
 
     def update(self):
-        self.x += self.velocity_x
-        self.y += self.velocity_y
-        self.velocity_y += self.gravity
-        self.lifetime -= 1
-        self.rotation += self.rotation_speed
-        self.scale *= self.scale_speed
-        
+        n = self.count
+        if n == 0:
+            return
+
+        self.x[:n] += self.velocity_x[:n]
+        self.y[:n] += self.velocity_y[:n]
+        self.velocity_y[:n] += PARTICLE_GRAVITY
+        self.lifetime[:n] -= 1
+        self.rotation[:n] += self.rotation_speed[:n]
+        self.scale[:n] *= self.scale_speed[:n]
+
         # Fade out
-        alpha = int(255 * (self.lifetime / self.original_lifetime))
-        self.color = (*self.color[:3], alpha)
-        
+        alpha = 255 * self.lifetime[:n] / self.original_lifetime[:n]
+        self.colors[:n, 3] = np.clip(alpha, 0, 255).astype(np.uint8)
+
         # Add some random movement
-        if random.random() < 0.1:  # 10% chance each frame
-            self.velocity_x += random.uniform(-0.2, 0.2)
-            self.velocity_y += random.uniform(-0.2, 0.2)
+        generator = rng.particles
+        jitter = generator.random(n) < PARTICLE_JITTER_CHANCE
+        jittered = int(np.count_nonzero(jitter))
+        if jittered:
+            self.velocity_x[:n][jitter] += generator.uniform(-PARTICLE_JITTER, PARTICLE_JITTER, jittered)
+            self.velocity_y[:n][jitter] += generator.uniform(-PARTICLE_JITTER, PARTICLE_JITTER, jittered)
+
+        # Compact live particles to the front in one pass
+        alive = self.lifetime[:n] > 0
+        live = int(np.count_nonzero(alive))
+        if live < n:
+            for name in self.FIELDS:
+                array = getattr(self, name)
+                array[:live] = array[:n][alive]
+            self.colors[:live] = self.colors[:n][alive]
+            self.count = live
 
     def draw(self, surface):
-        if self.lifetime > 0:
-            # Create a surface for the particle
-            particle_surface = pygame.Surface((int(self.size * 2 * self.scale), int(self.size * 2 * self.scale)), pygame.SRCALPHA)
-            
-            # Draw the particle with rotation
-            pygame.draw.circle(particle_surface, self.color, 
-                             (int(self.size * self.scale), int(self.size * self.scale)), 
-                             int(self.size * self.scale))
-            
-            # Rotate the particle
-            rotated_particle = pygame.transform.rotate(particle_surface, self.rotation)
-            
-            # Draw the rotated particle
-            surface.blit(rotated_particle, 
-                        (int(self.x - rotated_particle.get_width()/2), 
-                         int(self.y - rotated_particle.get_height()/2)))
+        n = self.count
+        if n == 0:
+            return []
+        # Filled discs look the same at any rotation, so rotation is not rendered
+        radius = (self.size[:n] * self.scale[:n]).astype(np.int64)
+        keys = stamp_atlas.particle_keys(radius, self.colors[:n])
+        visible = keys >= 0
+        xs = (self.x[:n] - radius).astype(np.int64)[visible].tolist()
+        ys = (self.y[:n] - radius).astype(np.int64)[visible].tolist()
+        particle_stamp = stamp_atlas.particle
+        return surface.blits([(particle_stamp(key), (x, y))
+                              for key, x, y in zip(keys[visible].tolist(), xs, ys)])
+
+particle_system = ParticleSystem()
 
 class AsteroidExplosion(pygame.sprite.Sprite):
     def __init__(self, x, y, size, level=1):
         pygame.sprite.Sprite.__init__(self)
-        self.particles = []
         self.x = x
         self.y = y
         self.size = size
         self.level = level
-        # Create a transparent surface for the sprite
-        self.image = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        # Shared transparent surface for the sprite
+        self.image = surface_registry.get(create_blank_surface, (size * 2, size * 2))
         self.rect = self.image.get_rect(center=(x, y))
-        self.create_particles()
+        # Frames until the last of our particles dies
+        self.lifetime = self.create_particles()
         
     def create_particles(self):
         # Create particles based on asteroid size and level
@@ -1040,41 +1593,31 @@ class AsteroidExplosion(pygame.sprite.Sprite):
         else:
             colors = [(200, 200, 200), (150, 150, 150), (100, 100, 100)]  # Gray theme
         
-        for _ in range(num_particles):
-            # Randomly select a color from the theme
-            base_color = random.choice(colors)
-            # Add some variation to the color
-            color = (
-                max(0, min(255, base_color[0] + random.randint(-20, 20))),
-                max(0, min(255, base_color[1] + random.randint(-20, 20))),
-                max(0, min(255, base_color[2] + random.randint(-20, 20))),
-                255
-            )
-            self.particles.append(Particle(self.x, self.y, self.size, color))
+        return particle_system.emit(self.x, self.y, num_particles, colors)
     
     def update(self):
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.lifetime <= 0:
-                self.particles.remove(particle)
-        if len(self.particles) == 0:
+        self.lifetime -= 1
+        if self.lifetime <= 0:
             self.kill()
     
     def draw(self, surface):
-        for particle in self.particles:
-            particle.draw(surface)
+        # Particles are drawn by particle_system
+        return []
 
-class PowerUp(pygame.sprite.Sprite):
+class PowerUp(PooledSprite, MaskedSprite):
     def __init__(self, type=None):
         super().__init__()
+        self.reset(type)
+
+    def reset(self, type=None):
         if type is None:
-            self.type = random.choice(['shield', 'laser', 'triple_shot'])
+            self.type = rng.spawn.choice(['shield', 'laser', 'triple_shot'])
         else:
             self.type = type
-        self.image = create_powerup(self.type)
+        self.image = surface_registry.get(create_powerup, self.type)
         self.rect = self.image.get_rect()
-        self.rect.x = random.randrange(WINDOW_WIDTH - self.rect.width)
-        self.rect.y = random.randrange(-100, -40)
+        self.rect.x = rng.spawn.randrange(WINDOW_WIDTH - self.rect.width)
+        self.rect.y = rng.spawn.randrange(-100, -40)
         self.speedy = 2
 
     def update(self):
@@ -1082,20 +1625,27 @@ class PowerUp(pygame.sprite.Sprite):
         if self.rect.top > WINDOW_HEIGHT:
             self.kill()
 
-class EnemyBullet(pygame.sprite.Sprite):
+powerup_pool = SpritePool(PowerUp)
+
+def create_enemy_bullet(orb_radius):
+    # Create a small glowing sphere (energy orb)
+    surface = pygame.Surface((orb_radius*2, orb_radius*2), pygame.SRCALPHA)
+    # Outer glow
+    radii = np.arange(orb_radius, 2, -2)
+    radial_gradient(surface, (orb_radius, orb_radius), radii, (0, 200, 255), (60 * (radii / orb_radius)).astype(int))
+    # Main orb
+    pygame.draw.circle(surface, (0, 255, 255), (orb_radius, orb_radius), orb_radius-2)
+    # Core
+    pygame.draw.circle(surface, (255, 255, 255), (orb_radius, orb_radius), 4)
+    return surface
+
+class EnemyBullet(PooledSprite):
     def __init__(self, x, y, angle=0, speed=5):
         super().__init__()
-        # Create a small glowing sphere (energy orb)
-        orb_radius = 10
-        self.image = pygame.Surface((orb_radius*2, orb_radius*2), pygame.SRCALPHA)
-        # Outer glow
-        for r in range(orb_radius, 2, -2):
-            alpha = int(60 * (r / orb_radius))
-            pygame.draw.circle(self.image, (0, 200, 255, alpha), (orb_radius, orb_radius), r)
-        # Main orb
-        pygame.draw.circle(self.image, (0, 255, 255), (orb_radius, orb_radius), orb_radius-2)
-        # Core
-        pygame.draw.circle(self.image, (255, 255, 255), (orb_radius, orb_radius), 4)
+        self.reset(x, y, angle, speed)
+
+    def reset(self, x, y, angle=0, speed=5):
+        self.image = surface_registry.get(create_enemy_bullet, 10)
         self.rect = self.image.get_rect()
         self.rect.centerx = x
         self.rect.top = y
@@ -1117,13 +1667,24 @@ class EnemyBullet(pygame.sprite.Sprite):
             self.kill()
 
     def draw(self, surface):
-        for i, pos in enumerate(self.trail_positions):
-            alpha = int(80 * (i / len(self.trail_positions)))
-            trail_surf = pygame.Surface((20, 20), pygame.SRCALPHA)
-            pygame.draw.circle(trail_surf, (0, 200, 255, alpha), (10, 10), 8)
-            trail_rect = trail_surf.get_rect(center=pos)
-            surface.blit(trail_surf, trail_rect)
-        surface.blit(self.image, self.rect)
+        # Trail fades in from the oldest position, using shared glow stamps
+        trail_length = len(self.trail_positions)
+        trail = []
+        for i, (x, y) in enumerate(self.trail_positions):
+            stamp = stamp_atlas.glow(8, (0, 200, 255), 80 * i / trail_length)
+            trail.append((stamp, (x - 8, y - 8)))
+        trail.append((self.image, self.rect))
+        rects = surface.blits(trail)
+        return [rects[-1].unionall(rects[:-1])]
+
+enemy_bullet_pool = SpritePool(EnemyBullet)
+
+# Pools by name, for sizing them from their high-water marks
+sprite_pools = {
+    'bullets': bullet_pool,
+    'enemy_bullets': enemy_bullet_pool,
+    'powerups': powerup_pool,
+}
 
 def create_boss(size):
     # Create a surface for the boss
@@ -1135,10 +1696,9 @@ def create_boss(size):
     core_radius = int(size * 0.35)
     
     # Energy shield effect
-    for r in range(shield_radius, core_radius, -1):
-        alpha = int(100 * (r / shield_radius))
-        color = (0, 150, 255, alpha)  # Cyan energy shield
-        pygame.draw.circle(surface, color, (size//2, size//2), r)
+    radii = np.arange(shield_radius, core_radius, -1)
+    radial_gradient(surface, (size//2, size//2), radii, (0, 150, 255),  # Cyan energy shield
+                    (100 * (radii / shield_radius)).astype(int))
     
     # Main core - metallic hexagon
     points = []
@@ -1149,10 +1709,9 @@ def create_boss(size):
         points.append((x, y))
     
     # Core gradient
-    for r in range(core_radius, 0, -1):
-        alpha = int(255 * (r / core_radius))
-        color = (50, 50, 80, alpha)  # Dark metallic blue
-        pygame.draw.circle(surface, color, (size//2, size//2), r)
+    radii = np.arange(core_radius, 0, -1)
+    radial_gradient(surface, (size//2, size//2), radii, (50, 50, 80),  # Dark metallic blue
+                    (255 * (radii / core_radius)).astype(int))
     
     # Core border
     pygame.draw.polygon(surface, (100, 100, 255), points)  # Bright blue edges
@@ -1160,9 +1719,8 @@ def create_boss(size):
     
     # Energy core
     core_size = int(size * 0.15)
-    for r in range(core_size, 0, -1):
-        alpha = int(255 * (r / core_size))
-        pygame.draw.circle(surface, (0, 200, 255, alpha), (size//2, size//2), r)
+    radii = np.arange(core_size, 0, -1)
+    radial_gradient(surface, (size//2, size//2), radii, (0, 200, 255), (255 * (radii / core_size)).astype(int))
     pygame.draw.circle(surface, (255, 255, 255), (size//2, size//2), core_size, 2)
     
     # Energy tendrils
@@ -1192,20 +1750,84 @@ def create_boss(size):
         orb_size = int(size * 0.08)
         
         # Orb glow
-        for r in range(orb_size, 0, -1):
-            alpha = int(200 * (r / orb_size))
-            pygame.draw.circle(surface, (0, 200, 255, alpha), (int(orb_x), int(orb_y)), r)
+        radii = np.arange(orb_size, 0, -1)
+        radial_gradient(surface, (int(orb_x), int(orb_y)), radii, (0, 200, 255),
+                        (200 * (radii / orb_size)).astype(int))
         
         # Orb border
         pygame.draw.circle(surface, (255, 255, 255), (int(orb_x), int(orb_y)), orb_size, 2)
     
     return surface
 
-class AlienBoss(pygame.sprite.Sprite):
-    def __init__(self, size):
+# Boss rotation frames. The art looks the same after half a turn, so frames
+# cover 0-180 degrees, as many as fit in BOSS_FRAMES_MAX_BYTES whatever the
+# window size. If that means steps coarser than BOSS_MAX_ROTATION_STEP the boss
+# rotates live instead, since it turns 1 degree per frame and big steps judder.
+BOSS_FRAMES_MAX_BYTES = 64 * 1024 * 1024
+BOSS_MAX_ROTATION_STEP = 3
+BOSS_BUILD_BUDGET = 0.004  # Seconds of frame building per game frame during the buffer period
+BOSS_SIZE_FRACTION = 0.25  # Boss size as a fraction of the window width
+
+boss_frame_sets = {}  # size -> (step in degrees or None, ((image, rect), ...))
+boss_frame_builders = {}  # size -> unfinished build_boss_frames generator
+
+def boss_rotation_step(art):
+    # Smallest whole-degree step dividing 180 whose frames fit under the cap,
+    # or None if that is coarser than BOSS_MAX_ROTATION_STEP.
+    # The 45 degree frame is the largest, so it bounds the rest.
+    side = math.ceil(max(art.get_size()) * math.sqrt(2))
+    largest = side * side * art.get_bytesize()
+    for step in range(1, BOSS_MAX_ROTATION_STEP + 1):
+        if 180 % step == 0 and 180 // step * largest <= BOSS_FRAMES_MAX_BYTES:
+            return step
+    return None
+
+def build_boss_frames(size):
+    # Builds boss_frame_sets[size] one piece at a time, yielding in between so
+    # the work can be spread over frames. Use boss_frame_builder() to get it.
+    if size not in boss_frame_sets:
+        art = surface_registry.get(create_boss, size)
+        yield
+        step = boss_rotation_step(art)
+        if step is None:
+            frames = ((art, art.get_rect()),)
+        else:
+            frames = []
+            for angle in range(0, 180, step):
+                image = pygame.transform.rotate(art, angle)
+                surface_counter.add()
+                mask_cache.get(image)
+                frames.append((image, image.get_rect()))
+                yield
+        boss_frame_sets[size] = (step, tuple(frames))
+    boss_frame_builders.pop(size, None)
+
+def boss_frame_builder(size):
+    # The one build in progress for size, so work done in earlier frames is never redone
+    builder = boss_frame_builders.get(size)
+    if builder is None:
+        builder = boss_frame_builders[size] = build_boss_frames(size)
+    return builder
+
+def get_boss_frames(size):
+    # Finishes whatever the build for size hasn't done yet
+    for _ in boss_frame_builder(size):
+        pass
+    return boss_frame_sets[size]
+
+def release_boss_frames():
+    # Drop finished frame sets once no boss needs them; builds in progress are
+    # kept so the next buffer period picks up where they left off
+    boss_frame_sets.clear()
+
+class AlienBoss(MaskedSprite):
+    def __init__(self, game, size):
         super().__init__()
-        self.image = create_boss(size)
-        self.rect = self.image.get_rect()
+        self.game = game
+        self.rotation_step, self.frames = get_boss_frames(int(size))
+        self.image, rect = self.frames[0]
+        self.rect = rect.copy()
+        self.radius = int(size) // 2  # The energy shield disc, whatever the rotation
         self.rect.centerx = WINDOW_WIDTH // 2
         self.rect.top = -size  # Start above screen
         self.speed = 2
@@ -1229,10 +1851,19 @@ class AlienBoss(pygame.sprite.Sprite):
         self.base_shoot_delay = 1000
 
     def update(self):
-        # Rotate the boss
+        # Rotate the boss by picking the nearest pre-rotated frame, or live
+        # when the window is too big to keep fine enough frames
         self.rotation = (self.rotation + self.rotation_speed) % 360
-        self.image = pygame.transform.rotate(self.original_image, self.rotation)
-        self.rect = self.image.get_rect(center=self.rect.center)
+        center = self.rect.center
+        if self.rotation_step is None:
+            self.image = pygame.transform.rotate(self.original_image, self.rotation)
+            surface_counter.add()
+            rect = self.image.get_rect()
+        else:
+            index = int(round(self.rotation / self.rotation_step)) % len(self.frames)
+            self.image, rect = self.frames[index]
+        self.rect = rect.copy()
+        self.rect.center = center
         
         # Descend until reaching target position
         if not self.has_reached_position:
@@ -1240,7 +1871,7 @@ class AlienBoss(pygame.sprite.Sprite):
                 self.rect.y += self.speed
             else:
                 self.has_reached_position = True
-                self.last_shot = pygame.time.get_ticks()
+                self.last_shot = sim_clock.get_ticks()
         
         # Horizontal movement based on health
         if self.has_reached_position:
@@ -1270,7 +1901,7 @@ class AlienBoss(pygame.sprite.Sprite):
                     self.movement_direction = 1
             
             # Shoot if reached target position
-            current_time = pygame.time.get_ticks()
+            current_time = sim_clock.get_ticks()
             if current_time - self.last_shot > self.shoot_delay:
                 self.shoot()
                 self.last_shot = current_time
@@ -1279,11 +1910,10 @@ class AlienBoss(pygame.sprite.Sprite):
             if self.health <= self.last_powerup_drop - 60:  # Changed from 80 to 60
                 self.last_powerup_drop = self.health
                 # Create triple shot powerup at boss position
-                powerup = PowerUp(type='triple_shot')  # Explicitly set type to triple_shot
+                powerup = powerup_pool.acquire(type='triple_shot')  # Explicitly set type to triple_shot
                 powerup.rect.centerx = self.rect.centerx
                 powerup.rect.top = self.rect.bottom
-                all_sprites.add(powerup)
-                powerups.add(powerup)
+                powerup.add(self.game.all_sprites, self.game.powerups)
                 powerup_sound.play()
 
     def shoot(self):
@@ -1311,15 +1941,14 @@ class AlienBoss(pygame.sprite.Sprite):
             angle = math.degrees(math.atan2(relative_x, 100))  # 100 is arbitrary distance for angle calculation
             
             # Add some random variation to the angle
-            angle += random.uniform(-10, 10)  # Add up to 10 degrees of variation
+            angle += rng.boss.uniform(-10, 10)  # Add up to 10 degrees of variation
             
-            bullet = EnemyBullet(spawn_x, spawn_y, angle)
-            all_sprites.add(bullet)
-            enemy_bullets.add(bullet)
+            bullet = enemy_bullet_pool.acquire(spawn_x, spawn_y, angle)
+            bullet.add(self.game.all_sprites, self.game.enemy_bullets)
 
     def draw(self, surface):
         # Draw the boss
-        surface.blit(self.image, self.rect)
+        dirty = [surface.blit(self.image, self.rect)]
         
         # Only draw health bar if we've reached our position
         if self.has_reached_position:
@@ -1328,7 +1957,7 @@ class AlienBoss(pygame.sprite.Sprite):
             health_bar_y = 20  # Fixed distance from top
             
             # Draw health bar background
-            pygame.draw.rect(surface, (50, 50, 50),
+            bar_rect = pygame.draw.rect(surface, (50, 50, 50),
                            (health_bar_x, health_bar_y,
                             self.health_bar_width, self.health_bar_height))
             
@@ -1352,32 +1981,56 @@ class AlienBoss(pygame.sprite.Sprite):
             pygame.draw.rect(surface, (255, 255, 255),
                            (health_bar_x, health_bar_y,
                             self.health_bar_width, self.health_bar_height), 2)
+            dirty.append(bar_rect)
+        return dirty
+
+def create_laser(height):
+    surface = pygame.Surface((10, height), pygame.SRCALPHA)
+    # Create gradient laser beam
+    for i in range(10):
+        alpha = 255 - i * 20
+        color = (0, 191, 255, alpha)  # Bright blue
+        pygame.draw.line(surface, color, (i, 0), (i, height), 1)
+    return surface
 
-class Laser(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+LASER_DPS = 60  # Damage per second to each asteroid in the beam
+
+class Laser(MaskedSprite):
+    def __init__(self, player):
         super().__init__()
-        self.image = pygame.Surface((10, WINDOW_HEIGHT), pygame.SRCALPHA)
-        # Create gradient laser beam
-        for i in range(10):
-            alpha = 255 - i * 20
-            color = (0, 191, 255, alpha)  # Bright blue
-            pygame.draw.line(self.image, color, (i, 0), (i, WINDOW_HEIGHT), 1)
+        self.player = player
+        self.image = surface_registry.get(create_laser, WINDOW_HEIGHT)
         self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.bottom = y  # Changed from top to bottom
+        self.rect.centerx = player.rect.centerx
+        self.rect.bottom = player.rect.top  # Changed from top to bottom
         self.damage = 2.5 * 2.0  # Increased from 1 to 2.5 and then multiplied by 2.00
-        self.last_damage = pygame.time.get_ticks()
+        self.last_damage = sim_clock.get_ticks()
         self.damage_delay = 500  # Changed from 100 to 500 (5 times slower)
+        self.beam_start = self.last_damage
+        self.beam_damage_dealt = 0
         # Start playing laser sound in loop
         laser_sound.play(-1)  # -1 means loop indefinitely
 
     def update(self):
         # Update position to follow player
-        self.rect.centerx = player.rect.centerx
-        self.rect.bottom = player.rect.top  # Keep laser at player's top
+        self.rect.centerx = self.player.rect.centerx
+        self.rect.bottom = self.player.rect.top  # Keep laser at player's top
+
+    def beam_damage(self, current_time):
+        # Whole damage points owed since the last call, at LASER_DPS of game time
+        total = (current_time - self.beam_start) * LASER_DPS // 1000
+        damage = total - self.beam_damage_dealt
+        self.beam_damage_dealt = total
+        return damage
+
+    def hits_circle(self, center, radius):
+        # Whether the beam's column touches the circle
+        dx = center[0] - max(self.rect.left, min(center[0], self.rect.right - 1))
+        dy = center[1] - max(self.rect.top, min(center[1], self.rect.bottom - 1))
+        return dx * dx + dy * dy <= radius * radius
 
     def draw(self, surface):
-        surface.blit(self.image, self.rect)
+        return [surface.blit(self.image, self.rect)]
 
     def kill(self):
         # Stop laser sound when laser is deactivated
@@ -1387,13 +2040,13 @@ class Laser(pygame.sprite.Sprite):
 class PlayerExplosion(pygame.sprite.Sprite):
     def __init__(self, x, y):
         pygame.sprite.Sprite.__init__(self)
-        self.particles = []
         self.x = x
         self.y = y
-        # Create a transparent surface for the sprite
-        self.image = pygame.Surface((50, 50), pygame.SRCALPHA)
+        # Shared transparent surface for the sprite
+        self.image = surface_registry.get(create_blank_surface, (50, 50))
         self.rect = self.image.get_rect(center=(x, y))
-        self.create_particles()
+        # Frames until the last of our particles dies
+        self.lifetime = self.create_particles()
         print("Player explosion created at", x, y)  # Debug print
         
     def create_particles(self):
@@ -1409,347 +2062,785 @@ class PlayerExplosion(pygame.sprite.Sprite):
             (200, 200, 255)   # Light purple
         ]
         
-        for _ in range(num_particles):
-            # Randomly select a color from the theme
-            base_color = random.choice(colors)
-            # Add some variation to the color
-            color = (
-                max(0, min(255, base_color[0] + random.randint(-20, 20))),
-                max(0, min(255, base_color[1] + random.randint(-20, 20))),
-                max(0, min(255, base_color[2] + random.randint(-20, 20))),
-                255
-            )
-            self.particles.append(Particle(self.x, self.y, 2, color))
+        return particle_system.emit(self.x, self.y, num_particles, colors)
     
     def update(self):
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.lifetime <= 0:
-                self.particles.remove(particle)
-        if len(self.particles) == 0:
+        self.lifetime -= 1
+        if self.lifetime <= 0:
             print("Player explosion finished")  # Debug print
             self.kill()
     
     def draw(self, surface):
-        print("Drawing player explosion with", len(self.particles), "particles")  # Debug print
-        for particle in self.particles:
-            particle.draw(surface)
-
-# Show start screen
-show_start_screen()
-
-# Show rocket selection
-selected_rocket = show_rocket_selection(ROCKET_TYPES)
-
-# Create sprite groups
-all_sprites = pygame.sprite.Group()
-bullets = pygame.sprite.Group()
-enemies = pygame.sprite.Group()
-powerups = pygame.sprite.Group()
-enemy_bullets = pygame.sprite.Group()
-player = Player(selected_rocket)
-all_sprites.add(player)
-
-# Spawn enemies
-for i in range(8):
-    # Weighted random choice for enemy levels
-    level = random.choices(
-        [1, 2, 3, 4],
-        weights=[0.4, 0.3, 0.2, 0.1]  # 40% level 1, 30% level 2, 20% level 3, 10% level 4
-    )[0]
-    new_enemy = Enemy(level)
-    all_sprites.add(new_enemy)
-    enemies.add(new_enemy)
-
-# Game variables
-score = 0
-high_score = load_high_score()
-font = pygame.font.Font(None, 36)
-game_over = False
-game_over_time = 0  # Track when game over occurred
-game_start_time = pygame.time.get_ticks()
-boss_spawned = False
-buffer_period = False
-buffer_start_time = 0
+        # Particles are drawn by particle_system
+        return []
+
+# Collision broadphase settings
+COLLISION_CELL_SIZE = 64  # Grid cell size in pixels
+
+class SpatialHash:
+    # Uniform grid of sprites by rect, rebuilt once per frame so collision
+    # checks only look at sprites in nearby cells
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (range(rect.left // size, (rect.right - 1) // size + 1),
+                range(rect.top // size, (rect.bottom - 1) // size + 1))
+
+    def rebuild(self, sprites):
+        self.cells.clear()
+        cells = self.cells
+        for sprite in sprites:
+            columns, rows = self.cell_range(sprite.rect)
+            for cx in columns:
+                for cy in rows:
+                    cell = cells.get((cx, cy))
+                    if cell is None:
+                        cells[(cx, cy)] = [sprite]
+                    else:
+                        cell.append(sprite)
+
+    def query(self, rect):
+        # Live sprites whose rect overlaps rect, each reported once
+        cells = self.cells
+        found = {}
+        columns, rows = self.cell_range(rect)
+        for cx in columns:
+            for cy in rows:
+                cell = cells.get((cx, cy))
+                if cell:
+                    for sprite in cell:
+                        found[sprite] = None
+        return [sprite for sprite in found if sprite.alive() and rect.colliderect(sprite.rect)]
+
+    def collide(self, sprite, dokill=False, collided=None):
+        # Grid-backed equivalent of pygame.sprite.spritecollide
+        hits = self.query(sprite.rect)
+        if collided is not None:
+            hits = [other for other in hits if collided(sprite, other)]
+        if dokill:
+            for other in hits:
+                other.kill()
+        return hits
+
+def init_pygame(headless=False, size=None, load=True):
+    # Set up pygame and the display, then load_assets() unless load is False.
+    # Headless runs use SDL's dummy video and audio drivers so no window is opened.
+    global WINDOW_WIDTH, WINDOW_HEIGHT, screen, clock
+
+    if headless:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+    # Initialize Pygame
+    pygame.init()
+    pygame.mixer.init()
+
+    if headless:
+        WINDOW_WIDTH, WINDOW_HEIGHT = size or HEADLESS_SIZE
+        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    else:
+        if size:
+            WINDOW_WIDTH, WINDOW_HEIGHT = size
+        else:
+            # Get screen info for fullscreen
+            screen_info = pygame.display.Info()
+            WINDOW_WIDTH = screen_info.current_w
+            WINDOW_HEIGHT = screen_info.current_h
+        # Set up the display - true fullscreen with hardware acceleration
+        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), 
+                                       pygame.FULLSCREEN | pygame.HWSURFACE | pygame.DOUBLEBUF | pygame.SCALED)
+        pygame.display.set_caption("Rocket Game")
+    clock = pygame.time.Clock()
+    if load:
+        load_assets()
+    return screen
+
+def create_missing_sounds():
+    # Create sound effects and music only if they don't exist
+    if not os.path.exists('assets'):
+        os.makedirs('assets')
+    if not os.path.exists('assets/shoot.wav'):
+        create_sound_effects()
+
+def create_missing_music():
+    if not os.path.exists('assets/background.wav'):
+        create_background_music()
+
+def load_sounds():
+    global shoot_sound, explosion_sound, powerup_sound, laser_sound
+    shoot_sound = pygame.mixer.Sound('assets/shoot.wav')
+    explosion_sound = pygame.mixer.Sound('assets/explosion.wav')
+    powerup_sound = pygame.mixer.Sound('assets/powerup.wav')
+    laser_sound = pygame.mixer.Sound('assets/laser.wav')
+
+    # Set sound effect volumes (0.0 to 1.0)
+    shoot_sound.set_volume(0.2)  # 20% volume
+    explosion_sound.set_volume(0.3)  # 30% volume
+    powerup_sound.set_volume(0.3)  # 30% volume
+    laser_sound.set_volume(0.2)  # 20% volume
+
+def load_background():
+    global space_background, fade_surface
+    space_background = asset_cache.get(create_space_background, BACKGROUND_SEED)
+
+    # Fade transition surface for the game over screen
+    fade_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+    fade_surface.fill(BLACK)
+
+def asset_tasks():
+    # Sounds and images the game needs, but the start screen does not, as
+    # (label, function) pieces. Needs the display from init_pygame().
+    tasks = [('sounds', create_missing_sounds), ('music', create_missing_music),
+             ('sounds', load_sounds), ('background', load_background)]
+    # Build asteroid shape variants once so spawning never draws asteroids
+    for level in ASTEROID_LEVELS:
+        tasks.append(('asteroids', lambda level=level: asteroid_templates.build_level(level)))
+    return tasks
+
+def load_assets():
+    for _, task in asset_tasks():
+        task()
+
+def warm_up_sprites():
+    for type in ('shield', 'laser', 'triple_shot'):
+        surface_registry.get(create_powerup, type)
+    for angle in (-15, 0, 15):
+        surface_registry.get(create_bullet, angle)
+    surface_registry.get(create_enemy_bullet, 10)
+    surface_registry.get(create_laser, WINDOW_HEIGHT)
+
+def warm_up_rocket(rocket_type):
+    # Warp-in frames and shield animation, whichever rocket gets picked
+    ladder = surface_registry.get(create_warp_ladder, rocket_type, 0.6)
+    surface_registry.get(create_shield_frames, ladder[-1][1].size)
+
+def warm_up_text():
+    for text, size in (('Score: 0', 36), ('Lives: 3', 36), ('Time: 0s', 36), ('PAUSED', 120),
+                       ('GAME OVER', 74), ('Press R to Retry', 48), ('Press M for Main Menu', 48)):
+        text_cache.render(text, size, WHITE)
+    text_cache.render('BOSS INCOMING!', 120, (255, 0, 0))
+    text_cache.render('Press ESC to Quit', 48, GRAY)
+    text_cache.font(24)
+
+def warm_up_tasks():
+    # asset_tasks() plus everything else the first gameplay frames would build
+    tasks = asset_tasks()
+    tasks.append(('sprites', warm_up_sprites))
+    for rocket_type in ROCKET_TYPES:
+        tasks.append(('rockets', lambda rocket_type=rocket_type: warm_up_rocket(rocket_type)))
+    tasks.append(('text', warm_up_text))
+    tasks.append(('music', lambda: pygame.mixer.music.load('assets/background.wav')))
+    return tasks
+
+WARM_UP_BUDGET = 0.02  # Seconds of warm-up work between menu input checks
+
+class WarmUp:
+    # Runs (label, function) tasks a few at a time while the menus wait for input
+    def __init__(self, tasks):
+        self.tasks = deque(tasks)
+        self.total = len(self.tasks)
+        self.label = ''
+
+    def pending(self):
+        return bool(self.tasks)
+
+    def progress(self):
+        return 1 - len(self.tasks) / self.total if self.total else 1
+
+    def run(self, budget=WARM_UP_BUDGET):
+        deadline = time.perf_counter() + budget
+        while self.tasks:
+            self.label, task = self.tasks.popleft()
+            task()
+            if time.perf_counter() >= deadline:
+                break
+
+    def finish(self):
+        while self.tasks:
+            self.run()
 
 # Fade transition variables
-fade_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-fade_surface.fill(BLACK)
-fade_alpha = 0
 fade_speed = 2  # Alpha change per frame
-transition_state = None  # None, 'delay', 'fading_out', 'fading_in'
-transition_start_time = 0
 transition_delay = 1000  # 2 second delay between fade out and fade in
 game_over_delay = 1500  # 1.5 seconds of continued gameplay after game over
 
-# Create assets directory if it doesn't exist
-if not os.path.exists('assets'):
-    os.makedirs('assets')
-
-# Create sound effects and music only if they don't exist
-if not os.path.exists('assets/shoot.wav'):
-    create_sound_effects()
-if not os.path.exists('assets/background.wav'):
-    create_background_music()
-
-# Load and play background music immediately
-pygame.mixer.music.load('assets/background.wav')
-pygame.mixer.music.play(-1)  # -1 means loop indefinitely
-pygame.mixer.music.set_volume(0.3)  # Set volume to 30%
-
-# Game loop
-running = True
-while running:
-    # Event handling
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                running = False
+def read_inputs():
+    # Map the keyboard state to the action names used by Game.step
+    keys = pygame.key.get_pressed()
+    inputs = set()
+    if keys[pygame.K_LEFT]:
+        inputs.add('left')
+    if keys[pygame.K_RIGHT]:
+        inputs.add('right')
+    if keys[pygame.K_UP]:
+        inputs.add('up')
+    if keys[pygame.K_DOWN]:
+        inputs.add('down')
+    if keys[pygame.K_SPACE]:
+        inputs.add('shoot')
+    return inputs
+
+# Dirty-rectangle rendering settings
+DIRTY_RECT_RENDERING = False  # Redraw and present only changed regions instead of the whole screen
+DIRTY_FLIP_FRACTION = 0.35  # Present the whole screen once changed regions cover this much of it
+
+class Game:
+    # Simulation state and per-frame game logic. Needs init_pygame() first;
+    # step() never touches the display, so it can run headless at full speed.
+    # Game time comes from sim_clock and randomness from the rng streams, so
+    # with fixed_step a given seed and input sequence always plays out the same.
+    # Each Game owns its clock, rng streams and particles; activate() points the
+    # module-level sim_clock, rng and particle_system that the sprites read at
+    # them, and every public method does so first. Several games can exist
+    # side by side, but their sprites must only be driven through their Game.
+    def __init__(self, rocket_type='default', headless=False, seed=None, fixed_step=None,
+                 dirty_rects=DIRTY_RECT_RENDERING):
+        self.sim_clock = SimClock()
+        self.rng = RandomStreams()
+        self.particles = ParticleSystem()
+        self.rocket_type = rocket_type
+        self.headless = headless
+        self.seed = seed
+        self.dirty_rects = dirty_rects
+        self.drawn_rects = []  # Screen rects drawn over this frame
+        self.previous_rects = []  # Drawn over last frame
+        self.repaint = True  # Whether the next frame must redraw the whole screen
+        self.full_redraw = True  # Whether this frame redrew the whole screen
+        if fixed_step is None:
+            fixed_step = headless  # Headless runs are not tied to the wall clock
+        self.fixed_step = 1000 / FPS if fixed_step else None
+        self.scripted = False  # When set, the boss timer and random spawns are left to the caller
+        self.high_score = load_high_score()
+        self.inputs = set()
+        self.paused = False
+        self.timings = {'update': 0.0, 'collision': 0.0, 'draw': 0.0, 'flip': 0.0}  # Seconds, last frame
+        self.player = None
+        self.enemy_grid = SpatialHash()
+        self.bullet_grid = SpatialHash()
+        self.enemy_bullet_grid = SpatialHash()
+        self.powerup_grid = SpatialHash()
+        self.reset()
+
+    def close(self):
+        # Return pooled sprites and stop the laser. The pools are shared, so a
+        # Game that is replaced rather than reset must be closed first.
+        if self.player is None:
+            return
+        if self.player.active_laser:
+            self.player.active_laser.kill()
+        for sprite in self.bullets.sprites() + self.enemy_bullets.sprites() + self.powerups.sprites():
+            sprite.kill()
+        release_boss_frames()
+
+    def activate(self):
+        # Make this game's clock, rng streams and particles the module-level ones
+        global sim_clock, rng, particle_system
+        sim_clock, rng, particle_system = self.sim_clock, self.rng, self.particles
+
+    def reset(self):
+        # Clean up the previous round
+        self.activate()
+        self.close()
+
+        # Restart game time and the random streams
+        sim_clock.reset(self.fixed_step)
+        self.invalidate()
+        rng.seed(self.seed)
+
+        # Create sprite groups
+        self.all_sprites = pygame.sprite.Group()
+        self.bullets = pygame.sprite.Group()
+        self.enemies = pygame.sprite.Group()
+        self.powerups = pygame.sprite.Group()
+        self.enemy_bullets = pygame.sprite.Group()
+        particle_system.clear()
+        self.player = Player(self, self.rocket_type)
+        self.all_sprites.add(self.player)
+
+        # Game variables
+        self.game_over = False
+        self.game_over_time = 0  # Track when game over occurred
+        self.game_start_time = sim_clock.get_ticks()
+        self.elapsed_time = 0
+        self.boss = None
+        self.boss_spawned = False
+        self.buffer_period = False
+        self.buffer_start_time = 0
+        self.boss_builder = None  # Builds the boss frames during the buffer period
+
+        # Spawn enemies
+        for i in range(8):
+            self.spawn_enemy()
+
+    def pause(self):
+        # Freeze game time and sound, e.g. while the window is in the background
+        if not self.paused:
+            self.activate()
+            self.paused = True
+            sim_clock.pause()
+            pygame.mixer.pause()
+            pygame.mixer.music.pause()
+
+    def resume(self):
+        if self.paused:
+            self.activate()
+            self.paused = False
+            sim_clock.resume()
+            pygame.mixer.unpause()
+            pygame.mixer.music.unpause()
+
+    def spawn_enemy(self):
+        # Weighted random choice for enemy levels
+        level = rng.spawn.choices(
+            [1, 2, 3, 4],
+            weights=[0.4, 0.3, 0.2, 0.1]  # 40% level 1, 30% level 2, 20% level 3, 10% level 4
+        )[0]
+        new_enemy = Enemy(level)
+        new_enemy.add(self.all_sprites, self.enemies)
+
+    def spawn_powerup(self, type=None):
+        powerup = powerup_pool.acquire(type)
+        powerup.add(self.all_sprites, self.powerups)
+
+    def step(self, inputs=()):
+        # Advance the simulation by one frame
+        self.activate()
+        surface_counter.start_frame()
+        sim_clock.advance()
+        self.inputs = inputs
+        start = time.perf_counter()
+        self.update()
+        collision_start = time.perf_counter()
+        self.check_collisions()
+        self.timings['update'] = collision_start - start
+        self.timings['collision'] = time.perf_counter() - collision_start
+
+    def run(self, frames, inputs=()):
+        # Step as fast as possible, drawing and flipping only with a window
+        for _ in range(frames):
+            self.step(inputs)
+            if not self.headless:
+                self.draw(screen)
+                self.present()
+
+    def snapshot(self):
+        # Gameplay state as plain values, for comparing runs of the same seed and inputs
+        return {
+            'ticks': self.sim_clock.get_ticks(),
+            'score': self.player.score,
+            'lives': self.player.lives,
+            'game_over': self.game_over,
+            'player': tuple(self.player.rect),
+            'enemies': [(tuple(enemy.rect), enemy.level, enemy.health) for enemy in self.enemies],
+            'bullets': [tuple(bullet.rect) for bullet in self.bullets],
+            'enemy_bullets': [tuple(bullet.rect) for bullet in self.enemy_bullets],
+            'powerups': [(powerup.type, tuple(powerup.rect)) for powerup in self.powerups],
+            'boss': (tuple(self.boss.rect), self.boss.health) if self.boss_spawned else None,
+        }
 
-    # Update game state
-    all_sprites.update()
-    current_time = pygame.time.get_ticks()
-    elapsed_time = (current_time - game_start_time) / 1000  # Convert to seconds
-
-    # Check for boss battle timing
-    if not boss_spawned and not buffer_period and elapsed_time >= 30:
-        buffer_period = True
-        buffer_start_time = current_time
-        # Create explosions for all existing enemies
-        for enemy in enemies:
-            explosion = AsteroidExplosion(enemy.rect.centerx, enemy.rect.centery, enemy.rect.width, enemy.level)
-            all_sprites.add(explosion)
-            enemy.kill()
-        enemies.empty()
-    
-    # Check buffer period (5 seconds)
-    if buffer_period and current_time - buffer_start_time >= 5000:  # 5 seconds
-        buffer_period = False
-        boss_spawned = True
-        boss = AlienBoss(WINDOW_WIDTH * 0.25)  # Spawn from center
-        all_sprites.add(boss)
-
-    # Only spawn enemies if not in buffer period and boss not spawned
-    if not buffer_period and not boss_spawned:
-        if random.random() < 0.02:  # 2% chance each frame
-            level = random.choices(
-                [1, 2, 3, 4],
-                weights=[0.4, 0.3, 0.2, 0.1]
-            )[0]
-            new_enemy = Enemy(level)
-            all_sprites.add(new_enemy)
-            enemies.add(new_enemy)
-        
-        # Add power-up spawning
-        if random.random() < 0.005:  # 0.5% chance each frame
-            powerup = PowerUp()
-            all_sprites.add(powerup)
-            powerups.add(powerup)
-
-    # Check for bullet-enemy collisions
-    hits = pygame.sprite.groupcollide(enemies, bullets, False, True)
-    for enemy, bullet_list in hits.items():
-        if enemy is not None:
-            enemy.health -= len(bullet_list)
-            if enemy.health <= 0:
-                player.add_score(enemy.points)
-                explosion_sound.play()
+    def update(self):
+        # Update game state
+        self.all_sprites.update()
+        particle_system.update()
+        current_time = sim_clock.get_ticks()
+        self.elapsed_time = (current_time - self.game_start_time) / 1000  # Convert to seconds
+
+        if self.scripted:
+            return
+
+        # Check for boss battle timing
+        if not self.boss_spawned and not self.buffer_period and self.elapsed_time >= 30:
+            self.buffer_period = True
+            self.buffer_start_time = current_time
+            self.boss_builder = boss_frame_builder(int(WINDOW_WIDTH * BOSS_SIZE_FRACTION))
+            # Create explosions for all existing enemies
+            for enemy in self.enemies:
                 explosion = AsteroidExplosion(enemy.rect.centerx, enemy.rect.centery, enemy.rect.width, enemy.level)
-                all_sprites.add(explosion)
-                if random.random() < 0.1:  # 10% chance
-                    powerup = PowerUp(type='shield')
-                    all_sprites.add(powerup)
-                    powerups.add(powerup)
+                self.all_sprites.add(explosion)
                 enemy.kill()
+            self.enemies.empty()
+        
+        # Check buffer period (5 seconds)
+        if self.buffer_period and current_time - self.buffer_start_time >= 5000:  # 5 seconds
+            self.buffer_period = False
+            self.boss_spawned = True
+            self.boss_builder = None
+            self.boss = AlienBoss(self, WINDOW_WIDTH * BOSS_SIZE_FRACTION)  # Spawn from center
+            self.all_sprites.add(self.boss)
+        elif self.buffer_period and self.boss_builder is not None:
+            # Build part of the boss each frame so it is ready when the buffer ends
+            deadline = time.perf_counter() + BOSS_BUILD_BUDGET
+            for _ in self.boss_builder:
+                if time.perf_counter() >= deadline:
+                    break
+            else:
+                self.boss_builder = None
 
-    # Check for laser-enemy collisions
-    if player.active_laser:
-        hits = pygame.sprite.spritecollide(player.active_laser, enemies, False)
-        for enemy in hits:
-            if enemy is not None:
-                enemy.health -= 1
+        # Only spawn enemies if not in buffer period and boss not spawned
+        if not self.buffer_period and not self.boss_spawned:
+            if rng.spawn.random() < 0.02:  # 2% chance each frame
+                self.spawn_enemy()
+            
+            # Add power-up spawning
+            if rng.spawn.random() < 0.005:  # 0.5% chance each frame
+                self.spawn_powerup()
+
+    def kill_boss(self, current_time):
+        self.boss.kill()
+        self.boss = None  # Drop the frames along with the sprite
+        release_boss_frames()
+        self.boss_spawned = False
+        self.player.add_score(1000)
+        self.game_start_time = current_time
+
+    def player_hit(self):
+        player = self.player
+        if player.active_laser:
+            player.active_laser.kill()
+            player.active_laser = None
+        explosion_sound.play()
+        explosion = PlayerExplosion(player.rect.centerx, player.rect.centery)
+        self.all_sprites.add(explosion)
+        player.lives -= 1
+        if player.lives <= 0:
+            self.game_over = True
+            self.game_over_time = sim_clock.get_ticks()
+            if player.score > self.high_score:
+                self.high_score = player.score
+                if not self.headless:
+                    save_high_score(self.high_score)
+        else:
+            player.respawn()
+
+    def check_collisions(self):
+        player = self.player
+        boss = self.boss
+        current_time = sim_clock.get_ticks()
+
+        # Rebuild the collision grids once per frame
+        self.enemy_grid.rebuild(self.enemies)
+        self.bullet_grid.rebuild(self.bullets)
+        self.enemy_bullet_grid.rebuild(self.enemy_bullets)
+        self.powerup_grid.rebuild(self.powerups)
+
+        # Check for shield collisions
+        if not self.game_over:
+            player.update_shield()
+
+        # Check for bullet-enemy collisions
+        for enemy in self.enemies.sprites():
+            bullet_list = self.bullet_grid.collide(enemy, True)
+            if bullet_list:
+                enemy.health -= len(bullet_list)
                 if enemy.health <= 0:
                     player.add_score(enemy.points)
                     explosion_sound.play()
-                    enemy.kill()
-
-    # Check for boss-related collisions
-    if boss_spawned and boss.has_reached_position:
-        # Check for bullet-boss collisions
-        hits = pygame.sprite.spritecollide(boss, bullets, True)
-        for hit in hits:
-            if hit is not None:
-                boss.health -= 1
-                if boss.health <= 0:
-                    boss.kill()
-                    boss_spawned = False
-                    player.add_score(1000)
-                    game_start_time = current_time
-        
-        # Check laser hitting boss
-        if player.laser_active and player.active_laser and pygame.sprite.collide_mask(player.active_laser, boss):
-            current_time = pygame.time.get_ticks()
-            if current_time - player.active_laser.last_damage > player.active_laser.damage_delay:
-                boss.health -= player.active_laser.damage
-                player.active_laser.last_damage = current_time
-                if boss.health <= 0:
-                    boss.kill()
-                    boss_spawned = False
-                    player.add_score(1000)
-                    game_start_time = current_time
-
-        # Check for boss-player collision
-        if not game_over and not player.is_respawning and not player.is_warping:
-            if pygame.sprite.collide_mask(player, boss) and not player.shield and not player.invulnerable:
-                if player.active_laser:
-                    player.active_laser.kill()
-                    player.active_laser = None
-                explosion_sound.play()
-                explosion = PlayerExplosion(player.rect.centerx, player.rect.centery)
-                all_sprites.add(explosion)
-                player.lives -= 1
-                if player.lives <= 0:
-                    game_over = True
-                    game_over_time = pygame.time.get_ticks()
-                    if player.score > high_score:
-                        high_score = player.score
-                        save_high_score(high_score)
-                else:
-                    player.respawn()
-
-    # Check for power-up collisions
-    if not game_over:
-        hits = pygame.sprite.spritecollide(player, powerups, True, pygame.sprite.collide_mask)
-        for powerup in hits:
-            if powerup is not None:
-                player.power_up(powerup.type)
-                powerup_sound.play()
-
-    # Check for enemy bullet-player collisions
-    if not game_over and not player.is_respawning and not player.is_warping:
-        hits = pygame.sprite.spritecollide(player, enemy_bullets, True)
-        if hits and not player.shield and not player.invulnerable:
-            hitbox_hits = [bullet for bullet in hits if player.hitbox_rect.colliderect(bullet.rect)]
-            if hitbox_hits:
-                if player.active_laser:
-                    player.active_laser.kill()
-                    player.active_laser = None
-                explosion_sound.play()
-                explosion = PlayerExplosion(player.rect.centerx, player.rect.centery)
-                all_sprites.add(explosion)
-                player.lives -= 1
-                if player.lives <= 0:
-                    game_over = True
-                    game_over_time = pygame.time.get_ticks()
-                    if player.score > high_score:
-                        high_score = player.score
-                        save_high_score(high_score)
-                else:
-                    player.respawn()
-
-    # Check for enemy-player collisions
-    if not game_over and not player.is_respawning and not player.is_warping:
-        hits = pygame.sprite.spritecollide(player, enemies, False)
-        if hits and not player.shield and not player.invulnerable:
-            hitbox_hits = [enemy for enemy in hits if player.hitbox_rect.colliderect(enemy.rect)]
-            if hitbox_hits:
-                if player.active_laser:
-                    player.active_laser.kill()
-                    player.active_laser = None
-                explosion_sound.play()
-                explosion = PlayerExplosion(player.rect.centerx, player.rect.centery)
-                all_sprites.add(explosion)
-                player.lives -= 1
-                if player.lives <= 0:
-                    game_over = True
-                    game_over_time = pygame.time.get_ticks()
-                    if player.score > high_score:
-                        high_score = player.score
-                        save_high_score(high_score)
-                else:
-                    player.respawn()
-                for enemy in hitbox_hits:
                     explosion = AsteroidExplosion(enemy.rect.centerx, enemy.rect.centery, enemy.rect.width, enemy.level)
-                    all_sprites.add(explosion)
+                    self.all_sprites.add(explosion)
+                    if rng.spawn.random() < 0.1:  # 10% chance
+                        self.spawn_powerup('shield')
                     enemy.kill()
 
-    # Draw
-    screen.blit(space_background, (0, 0))
-    
-    # Draw all sprites except player and boss
-    for sprite in all_sprites:
-        if sprite != player and not isinstance(sprite, AlienBoss):
-            if isinstance(sprite, (AsteroidExplosion, PlayerExplosion)):
-                sprite.draw(screen)
-            else:
-                screen.blit(sprite.image, sprite.rect)
-    
-    # Draw boss with health bar if spawned
-    if boss_spawned:
-        boss.draw(screen)
-    
-    # Draw player with shield if active, but only if not game over
-    if not game_over:
-        player.draw(screen)
-    
-    # Draw score and lives
-    score_text = font.render(f'Score: {player.get_score()}', True, WHITE)
-    screen.blit(score_text, (10, 10))
-    
-    lives_text = font.render(f'Lives: {player.lives}', True, WHITE)
-    screen.blit(lives_text, (10, 50))
-    
-    # Draw timer
-    timer_text = font.render(f'Time: {int(elapsed_time)}s', True, WHITE)
-    screen.blit(timer_text, (WINDOW_WIDTH - 150, 10))
-    
-    if buffer_period:
-        flash_alpha = int(255 * (0.5 + 0.5 * math.sin(pygame.time.get_ticks() / 200)))
-        warning_font = pygame.font.Font(None, 120)
-        buffer_text = warning_font.render('BOSS INCOMING!', True, (255, 0, 0))
-        buffer_text.set_alpha(flash_alpha)
-        text_rect = buffer_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
-        screen.blit(buffer_text, text_rect)
-
-    # Handle game over screen
-    if game_over:
-        should_continue, transition_state, fade_alpha, transition_start_time = show_game_over_screen(player.get_score(), high_score, transition_state, fade_alpha, transition_start_time)
-        if not should_continue:
-            # Reset game
-            all_sprites = pygame.sprite.Group()
-            bullets = pygame.sprite.Group()
-            enemies = pygame.sprite.Group()
-            powerups = pygame.sprite.Group()
-            enemy_bullets = pygame.sprite.Group()
-            player = Player(selected_rocket)
-            all_sprites.add(player)
-            
-            # Reset boss-related variables
-            boss_spawned = False
-            buffer_period = False
-            buffer_start_time = 0
+        # Check for laser-enemy collisions
+        if player.active_laser:
+            damage = player.active_laser.beam_damage(current_time)
+            if damage:
+                # The grid is already built this frame; the beam only touches its column of cells
+                for enemy in self.enemy_grid.query(player.active_laser.rect):
+                    enemy.health -= damage
+                    if enemy.health <= 0:
+                        player.add_score(enemy.points)
+                        explosion_sound.play()
+                        enemy.kill()
+
+        # Check for boss-related collisions
+        if self.boss_spawned and boss.has_reached_position:
+            # Check for bullet-boss collisions
+            hits = self.bullet_grid.collide(boss, True)
+            for hit in hits:
+                if hit is not None:
+                    boss.health -= 1
+                    if boss.health <= 0:
+                        self.kill_boss(current_time)
             
-            # Spawn new enemies
-            for i in range(8):
-                level = random.choices(
-                    [1, 2, 3, 4],
-                    weights=[0.4, 0.3, 0.2, 0.1]
-                )[0]
-                new_enemy = Enemy(level)
-                all_sprites.add(new_enemy)
-                enemies.add(new_enemy)
-            
-            game_over = False
-            transition_state = None
-            fade_alpha = 0
-            game_start_time = pygame.time.get_ticks()
-
-    pygame.display.flip()
-
-    # Cap the frame rate
-    clock.tick(FPS)
+            # Check laser hitting boss
+            if player.laser_active and player.active_laser and player.active_laser.hits_circle(boss.rect.center, boss.radius):
+                if current_time - player.active_laser.last_damage > player.active_laser.damage_delay:
+                    boss.health -= player.active_laser.damage
+                    player.active_laser.last_damage = current_time
+                    if boss.health <= 0:
+                        self.kill_boss(current_time)
+
+            # Check for boss-player collision
+            if not self.game_over and not player.is_respawning and not player.is_warping:
+                if pygame.sprite.collide_mask(player, boss) and not player.shield and not player.invulnerable:
+                    self.player_hit()
+
+        # Check for power-up collisions
+        if not self.game_over:
+            hits = self.powerup_grid.collide(player, True, pygame.sprite.collide_mask)
+            for powerup in hits:
+                if powerup is not None:
+                    player.power_up(powerup.type)
+                    powerup_sound.play()
+
+        # Check for enemy bullet-player collisions
+        if not self.game_over and not player.is_respawning and not player.is_warping:
+            hits = self.enemy_bullet_grid.collide(player, True)
+            if hits and not player.shield and not player.invulnerable:
+                hitbox_hits = [bullet for bullet in hits if player.hitbox_rect.colliderect(bullet.rect)]
+                if hitbox_hits:
+                    self.player_hit()
+
+        # Check for enemy-player collisions
+        if not self.game_over and not player.is_respawning and not player.is_warping:
+            hits = self.enemy_grid.query(player.rect)
+            if hits and not player.shield and not player.invulnerable:
+                hitbox_hits = [enemy for enemy in hits if player.hitbox_rect.colliderect(enemy.rect)]
+                if hitbox_hits:
+                    self.player_hit()
+                    for enemy in hitbox_hits:
+                        explosion = AsteroidExplosion(enemy.rect.centerx, enemy.rect.centery, enemy.rect.width, enemy.level)
+                        self.all_sprites.add(explosion)
+                        enemy.kill()
+
+    def invalidate(self):
+        # Something other than draw() painted the screen, e.g. a fade, so the
+        # next frame redraws and presents all of it
+        self.repaint = True
+
+    def present(self, extra_rects=()):
+        # extra_rects: regions drawn after draw(), such as overlays
+        start = time.perf_counter()
+        rects = self.drawn_rects + list(extra_rects)
+        if self.full_redraw or self.repaint or not self.dirty_rects:
+            pygame.display.flip()
+        else:
+            # Old positions must be presented too, now showing the background again
+            changed = self.previous_rects + rects
+            area = sum(rect.width * rect.height for rect in changed)
+            if area > DIRTY_FLIP_FRACTION * WINDOW_WIDTH * WINDOW_HEIGHT:
+                pygame.display.flip()
+            else:
+                pygame.display.update(changed)
+        self.previous_rects = rects
+        self.timings['flip'] = time.perf_counter() - start
 
-pygame.quit()
-sys.exit() 
\ No newline at end of file
+    def draw(self, surface):
+        self.activate()
+        start = time.perf_counter()
+        player = self.player
+        if self.dirty_rects and not self.repaint:
+            # Only restore the background where last frame drew
+            surface.blits([(space_background, rect, rect) for rect in self.previous_rects], doreturn=False)
+            self.full_redraw = False
+        else:
+            surface.blit(space_background, (0, 0))
+            self.full_redraw = True
+            self.repaint = False
+        dirty = []
+        
+        # Draw all sprites except player and boss
+        for sprite in self.all_sprites:
+            if sprite != player and not isinstance(sprite, AlienBoss):
+                if isinstance(sprite, (AsteroidExplosion, PlayerExplosion, EnemyBullet)):
+                    dirty.extend(sprite.draw(surface))
+                else:
+                    dirty.append(surface.blit(sprite.image, sprite.rect))
+        
+        # Draw all explosion particles in one pass
+        dirty.extend(particle_system.draw(surface))
+        
+        # Draw boss with health bar if spawned
+        if self.boss_spawned:
+            dirty.extend(self.boss.draw(surface))
+        
+        # Draw player with shield if active, but only if not game over
+        if not self.game_over:
+            dirty.extend(player.draw(surface))
+        
+        # Draw score and lives
+        score_text = text_cache.render(f'Score: {player.get_score()}', 36, WHITE)
+        dirty.append(surface.blit(score_text, (10, 10)))
+        
+        lives_text = text_cache.render(f'Lives: {player.lives}', 36, WHITE)
+        dirty.append(surface.blit(lives_text, (10, 50)))
+        
+        # Draw timer
+        timer_text = text_cache.render(f'Time: {int(self.elapsed_time)}s', 36, WHITE)
+        dirty.append(surface.blit(timer_text, (WINDOW_WIDTH - 150, 10)))
+        
+        if self.buffer_period:
+            flash_alpha = int(255 * (0.5 + 0.5 * math.sin(sim_clock.get_ticks() / 200)))
+            buffer_text = text_cache.render('BOSS INCOMING!', 120, (255, 0, 0))
+            buffer_text.set_alpha(flash_alpha)
+            text_rect = buffer_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
+            dirty.append(surface.blit(buffer_text, text_rect))
+
+        if self.paused:
+            paused_text = text_cache.render('PAUSED', 120, WHITE)
+            dirty.append(surface.blit(paused_text, paused_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))))
+        self.drawn_rects = dirty
+        self.timings['draw'] = time.perf_counter() - start
+
+# Performance overlay settings
+PERF_HISTORY = 120  # Frames shown in the sparkline
+PERF_GRAPH_SIZE = (280, 48)
+PERF_BUDGET = 1000 / FPS  # Milliseconds per frame at the target rate
+PERF_LINE_HEIGHT = 20
+PHASE_COLORS = {
+    'update': (0, 191, 255),
+    'collision': (255, 165, 0),
+    'draw': (0, 255, 0),
+    'flip': (200, 200, 200),
+}
+
+class PerfOverlay:
+    # Toggleable readout of frame rate, per-phase timings and live object counts,
+    # drawn under the score and lives
+    def __init__(self):
+        self.visible = False
+        self.font = text_cache.font(24)  # Its numbers change every frame, so it renders directly
+        self.frame_times = deque(maxlen=PERF_HISTORY)  # Milliseconds of work per frame
+        self.stamps = deque(maxlen=PERF_HISTORY)  # Wall-clock time of each frame
+        width, height = PERF_GRAPH_SIZE
+        self.panel = pygame.Surface((width + 20, height + PERF_LINE_HEIGHT * 8 + 24), pygame.SRCALPHA)
+        self.panel.fill((0, 0, 0, 160))
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def record(self, game):
+        # Call once per frame, after present()
+        self.stamps.append(time.perf_counter())
+        self.frame_times.append(sum(game.timings.values()) * 1000)
+
+    def fps(self):
+        if len(self.stamps) < 2:
+            return 0.0
+        return (len(self.stamps) - 1) / (self.stamps[-1] - self.stamps[0])
+
+    def draw(self, surface, game):
+        # Returns the screen rects drawn over
+        x, y = 10, 90
+        width, height = PERF_GRAPH_SIZE
+        panel_rect = surface.blit(self.panel, (x, y))
+        x += 10
+        y += 10
+
+        last = self.frame_times[-1] if self.frame_times else 0.0
+        surface.blit(self.font.render(f'FPS {self.fps():.0f}   frame {last:.1f} ms', True, WHITE), (x, y))
+        y += PERF_LINE_HEIGHT
+
+        # Frame-time sparkline, scaled so the frame budget sits halfway up
+        graph = pygame.Rect(x, y, width, height)
+        pygame.draw.rect(surface, GRAY, graph, 1)
+        budget_y = graph.bottom - height // 2
+        pygame.draw.line(surface, (255, 0, 0), (graph.left, budget_y), (graph.right - 1, budget_y))
+        if len(self.frame_times) > 1:
+            step = width / (PERF_HISTORY - 1)
+            points = [(graph.left + i * step,
+                       graph.bottom - 1 - min(ms / (PERF_BUDGET * 2), 1) * (height - 2))
+                      for i, ms in enumerate(self.frame_times)]
+            pygame.draw.lines(surface, WHITE, False, points)
+        y += height + 4
+
+        # Per-phase split of the last frame, with bars against the frame budget
+        for phase, color in PHASE_COLORS.items():
+            ms = game.timings[phase] * 1000
+            surface.blit(self.font.render(f'{phase} {ms:.2f} ms', True, color), (x, y))
+            bar_width = int(min(ms / PERF_BUDGET, 1) * (width - 140))
+            pygame.draw.rect(surface, color, (x + 140, y + 4, bar_width, PERF_LINE_HEIGHT - 10))
+            y += PERF_LINE_HEIGHT
+
+        # Live sprite counts, particles and surfaces created this frame
+        lines = (
+            f'enemies {len(game.enemies)}  bullets {len(game.bullets)}',
+            f'enemy bullets {len(game.enemy_bullets)}  powerups {len(game.powerups)}',
+            f'particles {particle_system.count}  new surfaces {surface_counter.count}',
+        )
+        for line in lines:
+            surface.blit(self.font.render(line, True, WHITE), (x, y))
+            y += PERF_LINE_HEIGHT
+        return [panel_rect]
+
+def report_first_frame():
+    print(f'Time to first frame: {(time.perf_counter() - startup_time) * 1000:.0f} ms')
+
+def main():
+    # Only the display is needed for the start screen; the rest loads while
+    # the menus wait for input
+    init_pygame(load=False)
+    warm_up = WarmUp(warm_up_tasks())
+
+    # Show start screen
+    show_start_screen(report_first_frame, warm_up)
+
+    # Show rocket selection
+    selected_rocket = show_rocket_selection(ROCKET_TYPES, warm_up)
+    warm_up.finish()
+
+    game = Game(selected_rocket)
+    overlay = PerfOverlay()
+    fade_alpha = 0
+    transition_state = None  # None, 'delay', 'fading_out', 'fading_in'
+    transition_start_time = 0
+
+    # Play the background music loaded during warm-up
+    pygame.mixer.music.play(-1)  # -1 means loop indefinitely
+    pygame.mixer.music.set_volume(0.3)  # Set volume to 30%
+
+    # Game loop
+    running = True
+    while running:
+        # Event handling
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_F3:
+                    overlay.toggle()
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                game.pause()
+                # Show the paused frame once, then stop rendering
+                if not game.game_over:
+                    game.draw(screen)
+                    game.invalidate()
+                    game.present()
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                game.resume()
+
+        if game.paused:
+            clock.tick(PAUSED_FPS)
+            continue
+
+        game.step(read_inputs())
+        game.draw(screen)
+
+        # Handle game over screen
+        if game.game_over:
+            should_continue, transition_state, fade_alpha, transition_start_time = show_game_over_screen(game.player.get_score(), game.high_score, transition_state, fade_alpha, transition_start_time)
+            if not should_continue:
+                game.reset()
+                transition_state = None
+                fade_alpha = 0
+            game.invalidate()
+
+        overlay_rects = overlay.draw(screen, game) if overlay.visible else []
+        game.present(overlay_rects)
+        overlay.record(game)
+
+        # Cap the frame rate
+        clock.tick(FPS)
+
+    game.close()
+    pygame.quit()
+    sys.exit()
+
+if __name__ == '__main__':
+    main()